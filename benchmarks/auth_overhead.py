@@ -0,0 +1,78 @@
+"""
+Measures the per-request overhead of Auth.get_current_user: a route without
+authentication against the same route behind a hit in the in-process user cache,
+a hit in Redis and a miss in both that loads the user from the database. The
+decoded token stays cached in every case, so only the user lookup differs.
+
+Runs in-process against the database and Redis configured in settings; the
+user given with --email has to exist. Run from the repository root:
+
+    python -m benchmarks.auth_overhead --email user@example.com
+"""
+import argparse
+import asyncio
+import statistics
+
+from fastapi import Depends, FastAPI
+from httpx import AsyncClient
+
+from src.database.db import engine
+from src.database.models import User
+from src.services.auth import auth_servise
+from src.services.user_cache import local_users, user_cache_key
+from benchmarks.utils import measure, summary
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/anonymous")
+    async def anonymous():
+        return {}
+
+    @app.get("/authenticated")
+    async def authenticated(current_user: User = Depends(auth_servise.get_current_user)):
+        return {}
+
+    return app
+
+
+async def main(email: str, requests: int) -> None:
+    token = await auth_servise.create_access_token(data={"sub": email})
+    headers = {"Authorization": f"Bearer {token}"}
+    async with AsyncClient(app=make_app(), base_url="http://benchmark") as client:
+
+        async def anonymous():
+            (await client.get("/anonymous")).raise_for_status()
+
+        async def local_hit():
+            (await client.get("/authenticated", headers=headers)).raise_for_status()
+
+        async def redis_hit():
+            local_users.pop(email)
+            await local_hit()
+
+        async def cache_miss():
+            local_users.pop(email)
+            await auth_servise.r.delete(user_cache_key(email))
+            await local_hit()
+
+        results = {}
+        calls = (("no auth", anonymous), ("local hit", local_hit), ("redis hit", redis_hit), ("cache miss", cache_miss))
+        for name, call in calls:
+            await measure(call, max(requests // 10, 1))
+            results[name] = await measure(call, requests)
+            print(summary(name, results[name]))
+    baseline = statistics.median(results["no auth"])
+    for name in ("local hit", "redis hit", "cache miss"):
+        overhead = (statistics.median(results[name]) - baseline) * 1000
+        print(f"auth overhead, {name:<10} {overhead:7.2f} ms per request (p50)")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.email, args.requests))
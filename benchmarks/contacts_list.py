@@ -0,0 +1,54 @@
+"""
+Compares the throughput of GET /api/contacts/?limit=1000 with the stdlib JSON
+and the orjson response classes, and with the precompiled list serializers.
+
+The application runs in-process against the database configured in settings;
+it has to contain at least --limit contacts. Run from the repository root:
+
+    python -m benchmarks.contacts_list --requests 200
+"""
+import argparse
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from httpx import AsyncClient
+
+from src.conf.config import settings
+from src.database.db import engine
+from src.routes import contacts
+from benchmarks.utils import as_user, measure, summary, without_rate_limits
+
+
+def make_app(response_class) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+    app.include_router(contacts.router, prefix="/api")
+    return as_user(without_rate_limits(app))
+
+
+async def main(requests: int, limit: int) -> None:
+    variants = (
+        ("JSONResponse", JSONResponse, False),
+        ("ORJSONResponse", ORJSONResponse, False),
+        ("precompiled serializers", ORJSONResponse, True),
+    )
+    for name, response_class, precompiled in variants:
+        settings.precompiled_serializers = precompiled
+        async with AsyncClient(app=make_app(response_class), base_url="http://benchmark") as client:
+
+            async def call():
+                response = await client.get("/api/contacts/", params={"limit": limit})
+                response.raise_for_status()
+
+            await measure(call, max(requests // 10, 1))  # warm up the pool and caches
+            latencies = await measure(call, requests)
+        print(summary(name, latencies))
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.limit))
@@ -0,0 +1,98 @@
+"""
+Measures the latency of GET /api/contacts/ while logins are in flight: without
+logins, with bcrypt running inline on the event loop and with bcrypt running
+in the password worker pool.
+
+The application runs in-process against the database and Redis configured in
+settings; the confirmed user given with --email and --password has to exist.
+Run from the repository root:
+
+    python -m benchmarks.login_contention --email user@example.com --password secret
+"""
+import argparse
+import asyncio
+from contextlib import contextmanager
+
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from src.conf.config import settings
+from src.database.db import engine
+from src.routes import auth, contacts
+from src.services.auth import auth_servise
+from src.services.passwords import password_pool
+from benchmarks.utils import as_user, measure, summary, without_rate_limits
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(auth.router, prefix="/api")
+    app.include_router(contacts.router, prefix="/api")
+    return as_user(without_rate_limits(app))
+
+
+@contextmanager
+def inline_bcrypt():
+    """
+    The inline_bcrypt function restores the old behaviour for the duration of the block:
+    passwords are verified synchronously on the event loop.
+
+    :return: None
+    :doc-author: Trelent
+    """
+    async def verify_password_async(plain_password, hashed_password):
+        return auth_servise.verify_password(plain_password, hashed_password)
+
+    auth_servise.verify_password_async = verify_password_async
+    try:
+        yield
+    finally:
+        del auth_servise.verify_password_async
+
+
+async def keep_logging_in(client: AsyncClient, email: str, password: str) -> None:
+    while True:
+        response = await client.post("/api/auth/login", data={"username": email, "password": password})
+        response.raise_for_status()
+
+
+async def run(client: AsyncClient, requests: int, logins: int, email: str, password: str):
+    async def call():
+        (await client.get("/api/contacts/", params={"limit": 20})).raise_for_status()
+
+    await measure(call, max(requests // 10, 1))  # warm up the pool and caches
+    workers = [asyncio.create_task(keep_logging_in(client, email, password)) for _ in range(logins)]
+    try:
+        await asyncio.sleep(0.5)  # let the first logins reach bcrypt
+        return await measure(call, requests)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        for result in await asyncio.gather(*workers, return_exceptions=True):
+            if not isinstance(result, asyncio.CancelledError):
+                raise result
+
+
+async def main(email: str, password: str, requests: int, logins: int) -> None:
+    async with AsyncClient(app=make_app(), base_url="http://benchmark") as client:
+        print(summary("no logins", await run(client, requests, 0, email, password)))
+        with inline_bcrypt():
+            print(summary(f"{logins} logins, inline", await run(client, requests, logins, email, password)))
+        print(summary(f"{logins} logins, pool", await run(client, requests, logins, email, password)))
+    wait = password_pool.stats()["queue_wait_seconds"]
+    print(
+        f"password pool: {settings.password_hash_workers} workers, {wait['count']} calls,"
+        f" mean queue wait {wait['sum'] / max(wait['count'], 1) * 1000:.1f} ms"
+    )
+    password_pool.shutdown()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--logins", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.email, args.password, args.requests, args.logins))
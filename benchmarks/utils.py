@@ -0,0 +1,97 @@
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from fastapi import FastAPI, HTTPException, status
+from fastapi_limiter.depends import RateLimiter
+
+from src.database.models import Role, User
+from src.services.auth import auth_servise
+from src.services.roles import RoleAccess
+
+
+def without_rate_limits(app: FastAPI) -> FastAPI:
+    """
+    The without_rate_limits function overrides every RateLimiter dependency of the app,
+    so a benchmark measures the handlers instead of the limiter (and needs no Redis).
+
+    :param app: FastAPI: The application under test
+    :return: The same application
+    :doc-author: Trelent
+    """
+    async def no_limit():
+        return None
+
+    for route in app.routes:
+        for dependency in getattr(route, "dependencies", []):
+            if isinstance(dependency.dependency, RateLimiter):
+                app.dependency_overrides[dependency.dependency] = no_limit
+    return app
+
+
+def as_user(app: FastAPI, role: Role = Role.admin) -> FastAPI:
+    """
+    The as_user function authenticates every request of the app as a fixed user with the given role.
+    With stateless roles RoleAccess reads the token itself, so every RoleAccess dependency is
+    replaced by a check of the user's role against the allowed roles of that instance.
+
+    :param app: FastAPI: The application under test
+    :param role: Role: The role of the user
+    :return: The same application
+    :doc-author: Trelent
+    """
+    user = User(id=1, username="benchmark", email="benchmark@example.com", roles=role, confirmed=True)
+
+    async def current_user():
+        return user
+
+    def role_access(allowed_roles):
+        async def check_role():
+            if user.roles not in allowed_roles:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN, detail="Operation forbidden"
+                )
+
+        return check_role
+
+    app.dependency_overrides[auth_servise.get_current_user] = current_user
+    for route in app.routes:
+        for dependency in getattr(route, "dependencies", []):
+            if isinstance(dependency.dependency, RoleAccess):
+                app.dependency_overrides[dependency.dependency] = role_access(
+                    dependency.dependency.allowed_roles
+                )
+    return app
+
+
+async def measure(call: Callable[[], Awaitable], requests: int) -> List[float]:
+    """
+    The measure function awaits call the given number of times and records every latency.
+
+    :param call: Callable[[], Awaitable]: The request to measure
+    :param requests: int: How many times to call it
+    :return: The latencies in seconds
+    :doc-author: Trelent
+    """
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await call()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def summary(name: str, latencies: List[float]) -> str:
+    """
+    The summary function formats throughput and latency percentiles of a run.
+
+    :param name: str: The label of the run
+    :param latencies: List[float]: The latencies in seconds
+    :return: A one-line report
+    :doc-author: Trelent
+    """
+    quantiles = statistics.quantiles(latencies, n=100)
+    return (
+        f"{name:<24} {len(latencies) / sum(latencies):8.1f} req/s"
+        f"  p50 {quantiles[49] * 1000:7.2f} ms  p99 {quantiles[98] * 1000:7.2f} ms"
+    )
@@ -7,24 +7,29 @@ from ipaddress import ip_address
 from fastapi import FastAPI, Depends, HTTPException, Request, status
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, ORJSONResponse
 from typing import Callable
 import pathlib
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi_limiter import FastAPILimiter
 from fastapi_limiter.depends import RateLimiter
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.database.db import get_db
-from src.routes import auth, notes, tags, contacts, users
+from src.database.db import get_db, query_stats, QueryStats
+from src.routes import auth, notes, tags, contacts, users, admin
 from src.conf.config import settings
+from src.services import counts
+from src.services.auth import auth_servise
+from src.services.passwords import password_pool
 
 logging.basicConfig(level=logging.DEBUG)
 
 
-app = FastAPI()
+app = FastAPI(
+    default_response_class=ORJSONResponse if settings.orjson_responses else JSONResponse
+)
 origins = ["*"]
 user_agent_ban_list = []  # [r"Gecko"]
 banned_ips = [
@@ -50,6 +55,7 @@ app.include_router(auth.router, prefix="/api")
 # app.include_router(notes.router, prefix="/api")
 app.include_router(contacts.router, prefix="/api")
 app.include_router(users.router, prefix='/api')
+app.include_router(admin.router, prefix="/api")
 
 templates = Jinja2Templates(directory="templates")
 
@@ -72,6 +78,28 @@ async def ban_ips(request: Request, call_next: Callable):
     return response
 
 
+@app.middleware("http")
+async def db_timing(request: Request, call_next: Callable):
+    """
+    The db_timing function counts the SQL statements issued while handling a request
+    and reports them with the X-DB-Queries and Server-Timing response headers.
+    
+    :param request: Request: The incoming request
+    :param call_next: Callable: Pass the request to the next handler
+    :return: The response with the database timing headers
+    :doc-author: Trelent
+    """
+    stats = QueryStats(f"{request.method} {request.url.path}")
+    token = query_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        query_stats.reset(token)
+    response.headers["X-DB-Queries"] = str(stats.count)
+    response.headers["Server-Timing"] = f"db;dur={stats.duration * 1000:.1f}"
+    return response
+
+
 @app.on_event("startup")
 async def startup():
     await asyncio.sleep(1)
@@ -83,6 +111,17 @@ async def startup():
         decode_responses=True,
     )
     await FastAPILimiter.init(r)
+    app.state.user_invalidations = asyncio.create_task(
+        auth_servise.listen_for_invalidations()
+    )
+    app.state.count_invalidations = asyncio.create_task(counts.listen_for_invalidations())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    app.state.user_invalidations.cancel()
+    app.state.count_invalidations.cancel()
+    password_pool.shutdown()
 
 
 @app.get("/favicon.ico", response_class=FileResponse)
@@ -156,13 +195,13 @@ async def register(request: Request):
 
 
 @app.get("/api/healthchaker")
-def healthchaker(db: Session = Depends(get_db)):
+async def healthchaker(db: AsyncSession = Depends(get_db)):
     """
     The healthchaker function is a simple function that returns a JSON object with the message &quot;Hello World&quot;.
     This function is used to test if the API server is running.
     
     
-    :param db: Session: Access the database
+    :param db: AsyncSession: Access the database
     :return: A dictionary with a message
     :doc-author: Trelent
     """
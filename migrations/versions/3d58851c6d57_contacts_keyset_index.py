@@ -0,0 +1,29 @@
+"""contacts_keyset_index
+
+Revision ID: 3d58851c6d57
+Revises: a7f06ded153e
+Create Date: 2026-10-17 10:12:31.412087
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d58851c6d57'
+down_revision: Union[str, None] = 'a7f06ded153e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE contacts SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column('contacts', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    op.create_index('ix_contacts_created_at_id', 'contacts', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_created_at_id', table_name='contacts')
+    op.alter_column('contacts', 'created_at', existing_type=sa.DateTime(), nullable=True)
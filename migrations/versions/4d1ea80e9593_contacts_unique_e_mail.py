@@ -0,0 +1,28 @@
+"""contacts_unique_e_mail
+
+Revision ID: 4d1ea80e9593
+Revises: 86987b430414
+Create Date: 2026-10-17 22:18:39.329636
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4d1ea80e9593'
+down_revision: Union[str, None] = '86987b430414'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if contacts already share an e-mail that differs only in case;
+    # such duplicates have to be merged by hand before upgrading.
+    op.create_index('ix_contacts_e_mail_lower', 'contacts', [sa.text('lower(e_mail)')], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_e_mail_lower', table_name='contacts')
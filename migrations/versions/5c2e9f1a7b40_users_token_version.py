@@ -0,0 +1,26 @@
+"""users_token_version
+
+Revision ID: 5c2e9f1a7b40
+Revises: 898b7375e8ef
+Create Date: 2026-10-17 23:41:12.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9f1a7b40'
+down_revision: Union[str, None] = '898b7375e8ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,36 @@
+"""contacts_trigram_indexes
+
+Revision ID: 713cb2cc5f0b
+Revises: 3d58851c6d57
+Create Date: 2026-10-17 11:02:47.518230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '713cb2cc5f0b'
+down_revision: Union[str, None] = '3d58851c6d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for column in ('name', 'last_name', 'e_mail'):
+        op.create_index(
+            f'ix_contacts_{column}_trgm',
+            'contacts',
+            [column],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={column: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    for column in ('e_mail', 'last_name', 'name'):
+        op.drop_index(f'ix_contacts_{column}_trgm', table_name='contacts')
@@ -0,0 +1,40 @@
+"""contacts_search_vector
+
+Revision ID: 732f9f78b027
+Revises: 713cb2cc5f0b
+Create Date: 2026-10-17 11:48:05.230671
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '732f9f78b027'
+down_revision: Union[str, None] = '713cb2cc5f0b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', name), 'A') || "
+            "setweight(to_tsvector('simple', last_name), 'A') || "
+            "setweight(to_tsvector('simple', e_mail), 'B') || "
+            "setweight(to_tsvector('simple', description), 'C')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_contacts_search_vector', 'contacts', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_search_vector', table_name='contacts')
+    op.drop_column('contacts', 'search_vector')
@@ -0,0 +1,36 @@
+"""contacts_birthday_key
+
+Revision ID: 86987b430414
+Revises: 732f9f78b027
+Create Date: 2026-10-17 12:31:19.804512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '86987b430414'
+down_revision: Union[str, None] = '732f9f78b027'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column(
+        'birthday_key',
+        sa.SmallInteger(),
+        sa.Computed(
+            "(EXTRACT(MONTH FROM born_date) * 100 + EXTRACT(DAY FROM born_date))::smallint",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_contacts_birthday_key', 'contacts', ['birthday_key'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_contacts_birthday_key', table_name='contacts')
+    op.drop_column('contacts', 'birthday_key')
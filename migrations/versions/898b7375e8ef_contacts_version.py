@@ -0,0 +1,30 @@
+"""contacts_version
+
+Revision ID: 898b7375e8ef
+Revises: 4d1ea80e9593
+Create Date: 2026-10-17 22:23:48.752632
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '898b7375e8ef'
+down_revision: Union[str, None] = '4d1ea80e9593'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('contacts', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.add_column('contacts', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.execute("UPDATE contacts SET updated_at = created_at")
+    op.alter_column('contacts', 'updated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('contacts', 'version')
+    op.drop_column('contacts', 'updated_at')
@@ -8,7 +8,33 @@ POSTGRES_PASSWORD=567234
 POSTGRES_PORT=5432
 POSTGRES_HOST="hw_web14-postgres-1"
 class Settings(BaseSettings):
-    sqlalchemy_database_url: str = "postgresql+psycopg2://${POSTGRES_USER}:${POSTGRES_PASSWORD}@${POSTGRES_HOST}:5432/${POSTGRES_DB}"
+    sqlalchemy_database_url: str = "postgresql+asyncpg://${POSTGRES_USER}:${POSTGRES_PASSWORD}@${POSTGRES_HOST}:5432/${POSTGRES_DB}"
+    sqlalchemy_replica_url: str | None = None
+    replica_max_lag: float = 5.0
+    replica_check_interval: float = 10.0
+    replica_connect_timeout: float = 2.0
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: int = 30
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    slow_query_threshold: float = 0.5
+    max_page_size: int = 1000
+    import_chunk_size: int = 1000
+    export_batch_size: int = 1000
+    import_max_errors: int = 1000
+    max_batch_size: int = 1000
+    orjson_responses: bool = True
+    precompiled_serializers: bool = True
+    total_count_ttl: float = 60.0
+    user_cache_ttl: int = 900
+    user_local_cache_size: int = 1024
+    user_local_cache_ttl: float = 60.0
+    password_hash_workers: int = 4
+    access_token_cache_size: int = 4096
+    access_token_cache_ttl: float = 900.0
+    stateless_roles: bool = False
+    stateless_token_ttl: int = 900
     secret_key: str = "secret_key"
     algorithm: str = "HS256"
     mail_username: str = "olegdenko@meta.ua"
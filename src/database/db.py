@@ -1,8 +1,20 @@
 # import configparser
 # import pathlib
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from src.conf.config import settings
+from src.services.metrics import Histogram
+
+logger = logging.getLogger(__name__)
 
 
 # file_config = pathlib.Path(__file__).parent.parent.joinpath("conf/config.ini")
@@ -21,21 +33,239 @@ from src.conf.config import settings
 
 URI = settings.sqlalchemy_database_url
 
-engine = create_engine(URI)
+checkout_wait = Histogram()
+
+
+class MeteredQueuePool(AsyncAdaptedQueuePool):
+    def _do_get(self):
+        """
+        The _do_get function checks a connection out of the pool and records how long the
+        caller had to wait for it. A warning is logged when the pool is saturated, so the
+        next checkout will block until a connection is returned or pool_timeout expires.
+
+        :param self: Represent the instance of the class
+        :return: A pooled connection record
+        :doc-author: Trelent
+        """
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            checkout_wait.observe(time.perf_counter() - start)
+            if self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow:
+                logger.warning(
+                    "Connection pool exhausted: %s connections checked out", self.checkedout()
+                )
+
+
+pool_options = dict(
+    pool_size=settings.pool_size,
+    max_overflow=settings.max_overflow,
+    pool_timeout=settings.pool_timeout,
+    pool_recycle=settings.pool_recycle,
+    pool_pre_ping=settings.pool_pre_ping,
+)
+
+engine = create_async_engine(URI, poolclass=MeteredQueuePool, **pool_options)
+
+SessionLocal = async_sessionmaker(
+    bind=engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+# a short connect timeout, so an unreachable replica does not stall reads for asyncpg's default 60 s
+replica_engine = (
+    create_async_engine(
+        settings.sqlalchemy_replica_url,
+        connect_args={"timeout": settings.replica_connect_timeout},
+        **pool_options,
+    )
+    if settings.sqlalchemy_replica_url
+    else None
+)
+
+ReadSessionLocal = (
+    async_sessionmaker(
+        bind=replica_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+    if replica_engine is not None
+    else SessionLocal
+)
+
+
+class QueryStats:
+    def __init__(self, route: str):
+        self.route = route
+        self.count = 0
+        self.duration = 0.0
+
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
 
 
-def get_db():
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
     """
-    The get_db function opens a new database connection if there is none yet for the current application context.
-    It will also create the database tables if they don’t exist yet.
+    The before_cursor_execute function remembers when a statement was sent to the database.
+
+    :param conn: Connection: The connection executing the statement
+    :return: None
+    :doc-author: Trelent
+    """
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """
+    The after_cursor_execute function adds the statement duration to the statistics of the
+    current request and logs statements slower than settings.slow_query_threshold.
+
+    :param conn: Connection: The connection executing the statement
+    :param statement: str: The SQL statement that was executed
+    :return: None
+    :doc-author: Trelent
+    """
+    duration = time.perf_counter() - conn.info["query_start_time"].pop()
+    stats = query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += duration
+    if duration >= settings.slow_query_threshold:
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            duration * 1000,
+            stats.route if stats is not None else "-",
+            statement,
+        )
+
+
+for _engine in (engine, replica_engine):
+    if _engine is not None:
+        event.listen(_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(_engine.sync_engine, "after_cursor_execute", after_cursor_execute)
+
+
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaMonitor:
+    def __init__(self, max_lag: float, check_interval: float):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.healthy = False
+        self.lag = None
+        self._checked_at = None
+
+    async def _replica_lag(self) -> float:
+        async with replica_engine.connect() as connection:
+            return float((await connection.execute(REPLICA_LAG_QUERY)).scalar() or 0)
+
+    async def is_healthy(self) -> bool:
+        """
+        The is_healthy function tells whether reads may be routed to the replica.
+        The replica is probed at most once per check_interval; it is considered unhealthy
+        when it can not be reached or its replay lag exceeds max_lag seconds.
+        The probe runs inside a request, so it gives up after settings.replica_connect_timeout.
+
+        :param self: Represent the instance of the class
+        :return: True if the replica can serve reads, otherwise False
+        :doc-author: Trelent
+        """
+        if replica_engine is None:
+            return False
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self.healthy
+        self._checked_at = now
+        try:
+            self.lag = await asyncio.wait_for(self._replica_lag(), settings.replica_connect_timeout)
+            self.healthy = self.lag <= self.max_lag
+            if not self.healthy:
+                logger.warning(
+                    "Replica lag %.1fs exceeds %.1fs, reading from primary",
+                    self.lag,
+                    self.max_lag,
+                )
+        except Exception as e:
+            logger.warning("Replica is unreachable, reading from primary: %s", e)
+            self.lag = None
+            self.healthy = False
+        return self.healthy
+
+
+replica_monitor = ReplicaMonitor(settings.replica_max_lag, settings.replica_check_interval)
+
+
+async def get_db(request: Request):
+    """
+    The get_db function opens a new asynchronous database session for the current request.
+    The session is the unit of work of the request: repositories only flush their changes,
+    TransactionalRoute commits them once when the endpoint succeeds and the transaction
+    is rolled back if the endpoint raises.
+    
+    :param request: Request: Register the session for TransactionalRoute
+    :return: An asynchronous database session
+    :doc-author: Trelent
+    """
+    async with SessionLocal() as db:
+        request.state.db = db
+        try:
+            yield db
+        except Exception:
+            await db.rollback()
+            raise
+
+
+class TransactionalRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        """
+        The get_route_handler function wraps the endpoint so the request session is committed
+        once, after the endpoint returned successfully and before the response is sent.
+        
+        :param self: Represent the instance of the class
+        :return: The route handler
+        :doc-author: Trelent
+        """
+        route_handler = super().get_route_handler()
+
+        async def transactional_route_handler(request: Request) -> Response:
+            response = await route_handler(request)
+            db = getattr(request.state, "db", None)
+            if db is not None and db.in_transaction() and response.status_code < 400:
+                await db.commit()
+            return response
+
+        return transactional_route_handler
+
+
+async def get_read_db():
+    """
+    The get_read_db function opens a read-only database session for GET endpoints.
+    The session is bound to the replica when one is configured and healthy,
+    otherwise it falls back to the primary database.
     
-    :return: A database session
+    :return: An asynchronous database session
     :doc-author: Trelent
     """
-    db = SessionLocal()
-    try:
+    session_factory = ReadSessionLocal if await replica_monitor.is_healthy() else SessionLocal
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close()
+
+
+def pool_status() -> dict:
+    """
+    The pool_status function reports the live state of the connection pool.
+
+    :return: A dictionary with checked-out, idle and overflow counts and the checkout wait-time histogram
+    :doc-author: Trelent
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.max_overflow,
+        "checkout_wait_seconds": checkout_wait.snapshot(),
+    }
@@ -1,6 +1,18 @@
 import enum
-from sqlalchemy import Column, Integer, String, Boolean, func, Table, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column,
+    Integer,
+    SmallInteger,
+    String,
+    Boolean,
+    func,
+    Table,
+    Enum,
+    Index,
+    Computed,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql.schema import ForeignKey
 from sqlalchemy.sql.sqltypes import Date, DateTime
 from sqlalchemy.ext.declarative import declarative_base
@@ -24,6 +36,7 @@ class User(Base):
     avatar = Column(String(255), nullable=False)
     roles = Column("roles", Enum(Role), default=Role.user)
     confirmed = Column(Boolean, default=False)
+    token_version = Column(Integer, nullable=False, default=1)
 
 
 note_m2m_tag = Table(
@@ -53,8 +66,56 @@ class Contact(Base):
     e_mail = Column(String(50), nullable=False)
     phone_number = Column(String(17), nullable=False)
     born_date = Column(Date, nullable=False)
+    birthday_key = Column(
+        SmallInteger,
+        Computed(
+            "(EXTRACT(MONTH FROM born_date) * 100 + EXTRACT(DAY FROM born_date))::smallint",
+            persisted=True,
+        ),
+    )
     description = Column(String(150), nullable=False)
-    created_at = Column("created_at", DateTime, default=func.now())
+    created_at = Column("created_at", DateTime, nullable=False, default=func.now())
+    updated_at = Column(
+        "updated_at", DateTime, nullable=False, default=func.now(), onupdate=func.now()
+    )
+    version = Column(Integer, nullable=False, default=1)
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                "setweight(to_tsvector('simple', name), 'A') || "
+                "setweight(to_tsvector('simple', last_name), 'A') || "
+                "setweight(to_tsvector('simple', e_mail), 'B') || "
+                "setweight(to_tsvector('simple', description), 'C')",
+                persisted=True,
+            ),
+        )
+    )
+
+    __table_args__ = (
+        Index("ix_contacts_created_at_id", "created_at", "id"),
+        Index(
+            "ix_contacts_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_contacts_last_name_trgm",
+            "last_name",
+            postgresql_using="gin",
+            postgresql_ops={"last_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_contacts_e_mail_trgm",
+            "e_mail",
+            postgresql_using="gin",
+            postgresql_ops={"e_mail": "gin_trgm_ops"},
+        ),
+        Index("ix_contacts_search_vector", "search_vector", postgresql_using="gin"),
+        Index("ix_contacts_birthday_key", "birthday_key"),
+        Index("ix_contacts_e_mail_lower", func.lower(e_mail), unique=True),
+    )
 
 
 class Tag(Base):
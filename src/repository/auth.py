@@ -4,7 +4,8 @@ from typing import Optional
 from fastapi import Depends, HTTPException
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from jose import JWTError, jwt
 from starlette import status
@@ -121,14 +122,14 @@ async def get_email_form_refresh_token(refresh_token: str):
 
 
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
 ):
     """
     The get_current_user function is a dependency that will be used in the protected endpoints.
     It takes an access token as input and returns the user object if it's valid, otherwise raises an exception.
     
     :param token: str: Get the token from the authorization header
-    :param db: Session: Get the database session
+    :param db: AsyncSession: Get the database session
     :return: The user object
     :doc-author: Trelent
     """
@@ -150,7 +151,8 @@ async def get_current_user(
     except JWTError as e:
         raise credentials_exception
 
-    user: User = db.query(User).filter(User.email == email).first()
+    user = await db.execute(select(User).filter_by(email=email))
+    user: User = user.scalar_one_or_none()
     if user is None:
         raise credentials_exception
     return user
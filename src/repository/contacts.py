@@ -1,223 +1,611 @@
+import calendar
 from fastapi import HTTPException
-from datetime import timedelta, datetime
-from typing import List
-from sqlalchemy.orm import Session
+from datetime import date, timedelta, datetime
+from typing import AsyncIterator, List, Sequence, Tuple
+from sqlalchemy import (
+    Integer,
+    any_,
+    bindparam,
+    delete,
+    func,
+    literal_column,
+    text,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.engine import Row, RowMapping
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Contact
+from src.services.counts import mark_changed, row_counts
 from src.schemas import (
     ContactModel,
     ContactUpdate,
-    ContactStatusUpdate,
-    ContactResponse,
+    ContactPatch,
+)
+
+
+def e_mail_conflict() -> HTTPException:
+    """
+    The e_mail_conflict function builds the 409 answer for a write that breaks the
+    unique index on lower(e_mail).
+
+    :return: The exception to raise
+    :doc-author: Trelent
+    """
+    return HTTPException(
+        status_code=409, detail="Conflict: Contact with this e-mail already exists"
+    )
+
+
+CONTACT_COLUMNS = (
+    Contact.id,
+    Contact.name,
+    Contact.last_name,
+    Contact.e_mail,
+    Contact.phone_number,
+    Contact.born_date,
+    Contact.description,
 )
 
 
-async def get_contact(contact_id: int, db: Session) -> Contact:
+def contact_columns(fields: Sequence[str] | None = None) -> tuple:
+    """
+    The contact_columns function picks the Contact columns for a sparse fieldset.
+    The id column is always included.
+
+    :param fields: Sequence[str] | None: The requested response fields, None for all of them
+    :return: The columns to select
+    :doc-author: Trelent
+    """
+    if not fields:
+        return CONTACT_COLUMNS
+    return tuple(column for column in CONTACT_COLUMNS if column.key in fields or column.key == "id")
+
+
+async def get_contact(contact_id: int, db: AsyncSession) -> Contact:
     """
     The get_contact function returns a contact from the database.
         Args:
             contact_id (int): The id of the contact to be returned.
-            db (Session): A connection to the database.
+            db (AsyncSession): A connection to the database.
         Returns:
             Contact: The requested Contact object.
     
     :param contact_id: int: Get the contact from the database
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: A contact object
     :doc-author: Trelent
     """
-    return db.query(Contact).filter(Contact.id == contact_id).first()
+    stmt = select(Contact).filter_by(id=contact_id)
+    contact = await db.execute(stmt)
+    return contact.scalar_one_or_none()
+
+
+async def get_contact_row(
+    contact_id: int, db: AsyncSession, fields: Sequence[str] | None = None
+) -> RowMapping | None:
+    """
+    The get_contact_row function selects the requested columns of a contact,
+        plus its version and updated_at, as a plain row.
+    
+    :param contact_id: int: The id of the contact
+    :param db: AsyncSession: Pass the database session to the function
+    :param fields: Sequence[str] | None: The requested response fields, None for all of them
+    :return: The contact row or None if it does not exist
+    :doc-author: Trelent
+    """
+    stmt = select(*contact_columns(fields), Contact.version, Contact.updated_at).filter_by(
+        id=contact_id
+    )
+    contact = await db.execute(stmt)
+    return contact.mappings().one_or_none()
+
+
+async def get_contacts_by_ids(ids: List[int], db: AsyncSession) -> List[Contact]:
+    """
+    The get_contacts_by_ids function loads many contacts with a single
+        WHERE id = ANY(:ids) query, bound as one array parameter.
+    
+    :param ids: List[int]: The ids of the contacts to load
+    :param db: AsyncSession: Pass the database session to the function
+    :return: The contacts found, in the order of ids; unknown ids are skipped
+    :doc-author: Trelent
+    """
+    stmt = select(Contact).where(Contact.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))))
+    contacts = await db.execute(stmt)
+    found = {contact.id: contact for contact in contacts.scalars().all()}
+    return [found[id] for id in dict.fromkeys(ids) if id in found]
+
+
+def _contacts_page(columns, skip: int, limit: int, after: Tuple[datetime, int] | None):
+    stmt = select(*columns).order_by(Contact.created_at, Contact.id).limit(limit)
+    if after is not None:
+        return stmt.filter(tuple_(Contact.created_at, Contact.id) > tuple_(*after))
+    return stmt.offset(skip)
 
 
-async def get_contacts(skip: int, limit: int, db: Session) -> List[Contact]:
+async def get_contacts(
+    skip: int,
+    limit: int,
+    db: AsyncSession,
+    after: Tuple[datetime, int] | None = None,
+    fields: Sequence[str] | None = None,
+) -> List[RowMapping]:
     """
     The get_contacts function returns a list of contacts from the database.
-        
+        Contacts are ordered by (created_at, id). When the after key is given the page
+        starts right behind it using the ix_contacts_created_at_id index (keyset pagination),
+        otherwise skip rows are skipped with OFFSET.
+        Only the requested response columns, created_at and version are selected, as plain rows.
     
     :param skip: int: Specify how many contacts to skip
     :param limit: int: Limit the number of results returned
-    :param db: Session: Access the database
-    :return: A list of contact objects
+    :param db: AsyncSession: Access the database
+    :param after: Tuple[datetime, int] | None: The (created_at, id) of the last contact of the previous page
+    :param fields: Sequence[str] | None: The requested response fields, None for all of them
+    :return: A list of contact rows
     :doc-author: Trelent
     """
-    return db.query(Contact).offset(skip).limit(limit).all()
+    columns = (*contact_columns(fields), Contact.created_at, Contact.version)
+    stmt = _contacts_page(columns, skip, limit, after)
+    contacts = await db.execute(stmt)
+    return contacts.mappings().all()
 
 
-async def get_upcoming_birthdays(db: Session) -> List[ContactResponse]:
+async def count_contacts(db: AsyncSession) -> int:
     """
-    The get_upcoming_birthdays function returns a list of contacts that have birthdays in the next 7 days.
+    The count_contacts function returns the exact number of contacts.
+        The COUNT(*) result is cached until a transaction that inserts or deletes
+        contacts commits in any worker, or for at most settings.total_count_ttl seconds
+        while the invalidation messages can not be delivered.
     
-    :param db: Session: Pass the database session to the function
-    :return: A list of contactresponse objects
+    :param db: AsyncSession: Access the database
+    :return: The number of contacts
     :doc-author: Trelent
     """
-    today = datetime.now()
-    end_date = today + timedelta(days=7)
-    contacts = (
-        db.query(Contact)
-        .filter(Contact.born_date >= today, Contact.born_date <= end_date)
-        .all()
+    count = row_counts.get(Contact.__tablename__)
+    if count is None:
+        count = await db.scalar(select(func.count()).select_from(Contact))
+        row_counts.set(Contact.__tablename__, count)
+    return count
+
+
+ESTIMATE_QUERY = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)")
+
+
+async def estimate_contacts(db: AsyncSession) -> int:
+    """
+    The estimate_contacts function returns the planner's estimate of the number of contacts
+        from pg_class.reltuples, which costs the same on any table size. The estimate is
+        refreshed by VACUUM and ANALYZE; for a table that was never analyzed the exact
+        count is used instead.
+    
+    :param db: AsyncSession: Access the database
+    :return: The estimated number of contacts
+    :doc-author: Trelent
+    """
+    estimate = await db.scalar(ESTIMATE_QUERY, {"table": Contact.__tablename__})
+    if estimate is None or estimate < 0:
+        return await count_contacts(db)
+    return estimate
+
+
+async def get_contacts_versions(
+    skip: int, limit: int, db: AsyncSession, after: Tuple[datetime, int] | None = None
+) -> List[RowMapping]:
+    """
+    The get_contacts_versions function selects only the id, version and created_at of the
+        page get_contacts would return, which is enough to answer a conditional request.
+    
+    :param skip: int: Specify how many contacts to skip
+    :param limit: int: Limit the number of results returned
+    :param db: AsyncSession: Access the database
+    :param after: Tuple[datetime, int] | None: The (created_at, id) of the last contact of the previous page
+    :return: A list of rows with id, version and created_at
+    :doc-author: Trelent
+    """
+    stmt = _contacts_page((Contact.id, Contact.version, Contact.created_at), skip, limit, after)
+    contacts = await db.execute(stmt)
+    return contacts.mappings().all()
+
+
+async def get_contact_version(contact_id: int, db: AsyncSession) -> Row | None:
+    """
+    The get_contact_version function reads the version and modification time of a contact
+        without loading the rest of the row.
+    
+    :param contact_id: int: The id of the contact
+    :param db: AsyncSession: Pass the database session to the function
+    :return: A row with version and updated_at, or None if the contact does not exist
+    :doc-author: Trelent
+    """
+    stmt = select(Contact.version, Contact.updated_at).filter_by(id=contact_id)
+    contact = await db.execute(stmt)
+    return contact.one_or_none()
+
+
+def birthday_keys(start: date, days: int) -> List[int]:
+    """
+    The birthday_keys function lists the month-day keys (month * 100 + day) of every date
+        from start to start + days, wrapping over the end of the year.
+        In non-leap years people born on February 29 celebrate on February 28.
+    
+    :param start: date: The first day of the window
+    :param days: int: The length of the window in days
+    :return: A list of birthday keys
+    :doc-author: Trelent
+    """
+    keys = []
+    for offset in range(days + 1):
+        day = start + timedelta(days=offset)
+        keys.append(day.month * 100 + day.day)
+        if day.month == 2 and day.day == 28 and not calendar.isleap(day.year):
+            keys.append(229)
+    return keys
+
+
+async def get_upcoming_birthdays(db: AsyncSession, days: int = 7) -> List[RowMapping]:
+    """
+    The get_upcoming_birthdays function returns a list of contacts that have birthdays in the next days days.
+        The birth year is ignored: contacts are matched on the indexed birthday_key column,
+        so the window may cross the new year (Dec 28 - Jan 3).
+    
+    :param db: AsyncSession: Pass the database session to the function
+    :param days: int: The length of the window in days
+    :return: A list of contact rows
+    :doc-author: Trelent
+    """
+    today = date.today()
+    today_key = today.month * 100 + today.day
+    stmt = (
+        select(*CONTACT_COLUMNS)
+        .filter(Contact.birthday_key.in_(birthday_keys(today, days)))
+        .order_by(Contact.birthday_key < today_key, Contact.birthday_key, Contact.id)
     )
-    return [
-        ContactResponse(
-            id=contact.id,
-            name=contact.name,
-            last_name=contact.last_name,
-            e_mail=contact.e_mail,
-            phone_number=contact.phone_number,
-            born_date=contact.born_date,
-            description=contact.description,
-        )
-        for contact in contacts
-    ]
+    contacts = await db.execute(stmt)
+    return contacts.mappings().all()
+
+
+SEARCH_CONFIG = literal_column("'simple'::regconfig")
+
+# '&' first, so the entities of the later replacements are not escaped again
+HTML_ENTITIES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#39;"))
+
+
+def html_escape(column):
+    """
+    The html_escape function escapes HTML special characters of a text column in SQL.
+
+    :param column: The text column or expression
+    :return: The escaped expression
+    :doc-author: Trelent
+    """
+    for char, entity in HTML_ENTITIES:
+        column = func.replace(column, char, entity)
+    return column
+
+
+def escape_like(value: str) -> str:
+    """
+    The escape_like function escapes the LIKE wildcards in user input,
+    so they are matched literally.
+
+    :param value: str: The raw search string
+    :return: The escaped search string
+    :doc-author: Trelent
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
 
 async def search_contacts(
-    name: str, last_name: str, e_mail: str, db: Session
-) -> Contact:
+    name: str,
+    last_name: str,
+    e_mail: str,
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    fields: Sequence[str] | None = None,
+) -> List[RowMapping]:
     """
     The search_contacts function searches for contacts in the database.
         It takes a name, last_name and e_mail as arguments.
         If any of these are provided, it will search for them in the database.
+        A single field matches as a case-insensitive substring; name with last_name and
+        last_name with e_mail must match exactly (case-insensitive). All filters are served
+        by the pg_trgm GIN indexes and results are ordered by trigram similarity.
     
     :param name: str: Search for a contact by name
     :param last_name: str: Filter the contacts by last name
     :param e_mail: str: Search for a contact by e-mail
-    :param db: Session: Pass the database session to the function
-    :return: A list of contacts
+    :param db: AsyncSession: Pass the database session to the function
+    :param skip: int: Skip the first n matches
+    :param limit: int: Limit the number of matches returned
+    :param fields: Sequence[str] | None: The requested response fields, None for all of them
+    :return: A list of contact rows
     :doc-author: Trelent
     """
-    query = db.query(Contact)
+    exact_name = bool(name and last_name)
+    exact_last_name = bool(last_name and (name or e_mail))
+    exact_e_mail = bool(last_name and e_mail)
 
-    if name:
-        query = query.filter(Contact.name.ilike(f"%{name}%"))
-    if last_name:
-        query = query.filter(Contact.last_name.ilike(f"%{last_name}%"))
-    if e_mail:
-        query = query.filter(Contact.e_mail.ilike(f"%{e_mail}%"))
+    stmt = select(*contact_columns(fields))
+    relevance = []
+    for column, value, exact in (
+        (Contact.name, name, exact_name),
+        (Contact.last_name, last_name, exact_last_name),
+        (Contact.e_mail, e_mail, exact_e_mail),
+    ):
+        if value:
+            pattern = escape_like(value) if exact else f"%{escape_like(value)}%"
+            stmt = stmt.filter(column.ilike(pattern, escape="\\"))
+            relevance.append(func.similarity(column, value))
 
-    contacts = query.all()
-    if name and last_name:
-        contacts = [
-            contact
-            for contact in contacts
-            if contact.name.lower() == name.lower()
-            and contact.last_name.lower() == last_name.lower()
-        ]
+    if relevance:
+        stmt = stmt.order_by(sum(relevance[1:], relevance[0]).desc())
+    stmt = stmt.order_by(Contact.id).offset(skip).limit(limit)
+    contacts = await db.execute(stmt)
+    return contacts.mappings().all()
 
-    if last_name and e_mail:
-        contacts = [
-            contact
-            for contact in contacts
-            if contact.last_name.lower() == last_name.lower()
-            and contact.e_mail.lower() == e_mail.lower()
-        ]
 
-    return contacts
+async def full_text_search(
+    q: str, limit: int, db: AsyncSession, after: Tuple[float, int] | None = None
+) -> List[dict]:
+    """
+    The full_text_search function finds contacts whose name, last name, e-mail or description
+        match a web-search style query (quoted phrases, "or", "-word").
+        Matches come from the GIN index on search_vector and are ordered by ts_rank_cd.
+        Pagination is keyset based on (rank, id), so deep pages cost the same as the first one.
+    
+    :param q: str: The search query
+    :param limit: int: Limit the number of matches returned
+    :param db: AsyncSession: Pass the database session to the function
+    :param after: Tuple[float, int] | None: The (rank, id) of the last match of the previous page
+    :return: A list of contact rows with rank and the description as an HTML-escaped headline
+    :doc-author: Trelent
+    """
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(Contact.search_vector, query)
+    # the description is user input, escape it so <mark> is the only markup of the headline
+    headline = func.ts_headline(
+        SEARCH_CONFIG, html_escape(Contact.description), query, "StartSel=<mark>, StopSel=</mark>"
+    )
+    stmt = (
+        select(*CONTACT_COLUMNS, rank.label("rank"), headline.label("headline"))
+        .filter(Contact.search_vector.bool_op("@@")(query))
+        .order_by(rank.desc(), Contact.id.desc())
+        .limit(limit)
+    )
+    if after is not None:
+        stmt = stmt.filter(tuple_(rank, Contact.id) < tuple_(*after))
+    contacts = await db.execute(stmt)
+    return contacts.mappings().all()
 
 
-async def create_contact(body: ContactModel, db: Session) -> ContactResponse:
+async def stream_contacts(db: AsyncSession, batch_size: int) -> AsyncIterator[List[dict]]:
+    """
+    The stream_contacts function reads all contacts through a server-side cursor.
+        Only batch_size rows are held in memory at a time and the first batch is
+        available before the whole table has been read.
+    
+    :param db: AsyncSession: Pass the database session to the function
+    :param batch_size: int: The number of rows fetched per round trip
+    :return: An async iterator over batches of contact rows
+    :doc-author: Trelent
+    """
+    stmt = select(*CONTACT_COLUMNS).order_by(Contact.id).execution_options(yield_per=batch_size)
+    contacts = await db.stream(stmt)
+    async for partition in contacts.mappings().partitions():
+        yield partition
+
+
+async def create_contact(body: ContactModel, db: AsyncSession) -> Contact:
     """
     The create_contact function creates a new contact in the database.
-        It takes a ContactModel object as input and returns a ContactResponse object.
+        It takes a ContactModel object as input and returns the new Contact.
         
     
     :param body: ContactModel: Get the data from the request body
-    :param db: Session: Create a database session
-    :return: A contactresponse object
+    :param db: AsyncSession: Create a database session
+    :return: The created contact
     :doc-author: Trelent
     """
+    contact = Contact(**body.model_dump())
+    db.add(contact)
     try:
-        contact = Contact(
-            name=body.name,
-            last_name=body.last_name,
-            e_mail=body.e_mail,
-            phone_number=body.phone_number,
-            born_date=body.born_date,
-            description=body.description,
-        )
-        db.add(contact)
-        db.commit()
-        db.refresh(contact)
-
-        return ContactResponse(
-            id=contact.id,
-            name=contact.name,
-            last_name=contact.last_name,
-            e_mail=contact.e_mail,
-            phone_number=contact.phone_number,
-            born_date=contact.born_date,
-            description=contact.description,
-        )
-    except Exception as e:
-        print(f"Error: {e}")
-        raise HTTPException(status_code=409, detail="Conflict: Something went wrong")
+        await db.flush()
+    except IntegrityError:
+        raise e_mail_conflict()
+    mark_changed(db, Contact.__tablename__)
+    return contact
+
+
+async def create_contacts(bodies: List[ContactModel], db: AsyncSession) -> int:
+    """
+    The create_contacts function inserts a batch of validated contacts with a single
+        multi-row INSERT statement, without loading them into the session.
+        Contacts whose e-mail is already taken are skipped.
+    
+    :param bodies: List[ContactModel]: The contacts to insert
+    :param db: AsyncSession: Pass the database session to the function
+    :return: The number of inserted contacts
+    :doc-author: Trelent
+    """
+    if not bodies:
+        return 0
+    stmt = (
+        pg_insert(Contact)
+        .on_conflict_do_nothing(index_elements=[func.lower(Contact.e_mail)])
+        .returning(Contact.id)
+    )
+    contacts = await db.execute(stmt, [body.model_dump() for body in bodies])
+    mark_changed(db, Contact.__tablename__)
+    return len(contacts.scalars().all())
+
+
+async def upsert_contacts(bodies: List[ContactModel], db: AsyncSession) -> List[Contact]:
+    """
+    The upsert_contacts function creates or updates contacts matched by e-mail with a single
+        INSERT ... ON CONFLICT DO UPDATE ... RETURNING statement.
+        When the same e-mail occurs more than once in bodies, the last one wins.
+    
+    :param bodies: List[ContactModel]: The contacts to create or update
+    :param db: AsyncSession: Pass the database session to the function
+    :return: The created or updated contacts
+    :doc-author: Trelent
+    """
+    rows = {body.e_mail.lower(): body.model_dump() for body in bodies}
+    if not rows:
+        return []
+    stmt = pg_insert(Contact).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[func.lower(Contact.e_mail)],
+        set_={
+            **{column: stmt.excluded[column] for column in ContactModel.model_fields},
+            "updated_at": func.now(),
+            "version": Contact.version + 1,
+        },
+    ).returning(Contact)
+    contacts = await db.scalars(stmt, execution_options={"populate_existing": True})
+    mark_changed(db, Contact.__tablename__)
+    return list(contacts.all())
 
 
-async def remove_contact(contact_id: int, db: Session) -> Contact | None:
+async def remove_contact(contact_id: int, db: AsyncSession) -> Contact | None:
     """
     The remove_contact function removes a contact from the database.
         Args:
             contact_id (int): The id of the contact to be removed.
-            db (Session): A connection to the database.
+            db (AsyncSession): A connection to the database.
         Returns:
             Contact | None: The deleted Contact object or None if no such object exists in the database.
     
     :param contact_id: int: Specify the id of the contact to be deleted
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: The contact that was deleted from the database
     :doc-author: Trelent
     """
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if contact:
-        db.delete(contact)
-        db.commit()
-    return contact
+    stmt = delete(Contact).filter_by(id=contact_id).returning(Contact)
+    contact = await db.execute(stmt)
+    mark_changed(db, Contact.__tablename__)
+    return contact.scalar_one_or_none()
 
 
 async def update_contact(
-    contact_id: int, body: ContactUpdate, db: Session
+    contact_id: int, body: ContactUpdate, db: AsyncSession
 ) -> Contact | None:
     """
     The update_contact function updates a contact in the database.
         Args:
             contact_id (int): The id of the contact to update.
             body (ContactUpdate): The updated information for the specified Contact.
-            db (Session): A connection to our database, used for querying and updating data.
+            db (AsyncSession): A connection to our database, used for querying and updating data.
     
     :param contact_id: int: Identify the contact that is going to be updated
     :param body: ContactUpdate: Pass the data from the request body to the function
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: The updated contact
     :doc-author: Trelent
     """
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if contact:
-        contact.name = (body.name,)
-        contact.last_name = (body.last_name,)
-        contact.e_mail = (body.e_mail,)
-        contact.phone_number = (body.phone_number,)
-        contact.born_date = (body.born_date,)
-        contact.description = (body.description,)
-        db.commit()
-    return contact
+    return await update_contact_fields(contact_id, body.model_dump(exclude={"done"}), db)
 
 
-async def update_status_contact(
-    contact_id: int, body: ContactStatusUpdate, db: Session
+async def patch_contact(
+    contact_id: int, body: ContactPatch, db: AsyncSession
 ) -> Contact | None:
     """
-    The update_status_contact function updates the status of a contact in the database.
-        
+    The patch_contact function updates only the fields supplied in the request body.
     
-    :param contact_id: int: Identify the contact that is being updated
-    :param body: ContactStatusUpdate: Update the status of a contact
-    :param db: Session: Get access to the database
+    :param contact_id: int: Identify the contact that is going to be updated
+    :param body: ContactPatch: The fields to change
+    :param db: AsyncSession: Pass the database session to the function
     :return: The updated contact
     :doc-author: Trelent
     """
-    contact = db.query(Contact).filter(Contact.id == contact_id).first()
-    if contact:
-        contact.done = body.done
-        db.commit()
-    return contact
+    fields = body.model_dump(exclude_unset=True, exclude_none=True)
+    return await update_contact_fields(contact_id, fields, db)
+
+
+async def update_contact_fields(
+    contact_id: int, fields: dict, db: AsyncSession
+) -> Contact | None:
+    """
+    The update_contact_fields function writes the given column values of a contact
+        with a single UPDATE ... RETURNING statement.
+    
+    :param contact_id: int: Identify the contact that is going to be updated
+    :param fields: dict: Column names and their new values
+    :param db: AsyncSession: Pass the database session to the function
+    :return: The updated contact or None if it does not exist
+    :raises HTTPException: 409 if the new e-mail is already used by another contact
+    :doc-author: Trelent
+    """
+    if not fields:
+        return await get_contact(contact_id, db)
+    stmt = (
+        update(Contact)
+        .filter_by(id=contact_id)
+        .values(**fields, version=Contact.version + 1)
+        .returning(Contact)
+    )
+    try:
+        contact = await db.execute(stmt)
+    except IntegrityError:
+        raise e_mail_conflict()
+    return contact.scalar_one_or_none()
+
+
+async def update_contacts(
+    ids: List[int], body: ContactPatch, db: AsyncSession
+) -> List[int]:
+    """
+    The update_contacts function applies the same changes to many contacts
+        with a single UPDATE ... WHERE id IN (...) RETURNING id statement.
+    
+    :param ids: List[int]: The ids of the contacts to update
+    :param body: ContactPatch: The fields to change
+    :param db: AsyncSession: Pass the database session to the function
+    :return: The ids of the contacts that were updated
+    :raises HTTPException: 409 if the changes break the unique e-mail index
+    :doc-author: Trelent
+    """
+    fields = body.model_dump(exclude_unset=True, exclude_none=True)
+    if not fields:
+        stmt = select(Contact.id).where(Contact.id.in_(ids))
+    else:
+        stmt = (
+            update(Contact)
+            .where(Contact.id.in_(ids))
+            .values(**fields, version=Contact.version + 1)
+            .returning(Contact.id)
+            .execution_options(synchronize_session=False)
+        )
+    try:
+        contacts = await db.execute(stmt)
+    except IntegrityError:
+        raise e_mail_conflict()
+    return list(contacts.scalars().all())
+
+
+async def remove_contacts(ids: List[int], db: AsyncSession) -> List[int]:
+    """
+    The remove_contacts function deletes many contacts with a single
+        DELETE ... WHERE id IN (...) RETURNING id statement.
+    
+    :param ids: List[int]: The ids of the contacts to delete
+    :param db: AsyncSession: Pass the database session to the function
+    :return: The ids of the contacts that were deleted
+    :doc-author: Trelent
+    """
+    stmt = (
+        delete(Contact)
+        .where(Contact.id.in_(ids))
+        .returning(Contact.id)
+        .execution_options(synchronize_session=False)
+    )
+    contacts = await db.execute(stmt)
+    mark_changed(db, Contact.__tablename__)
+    return list(contacts.scalars().all())
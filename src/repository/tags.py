@@ -1,38 +1,43 @@
 from typing import List
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Tag
 from src.schemas import TagModel
 
 
-async def get_tags(skip: int, limit: int, db: Session) -> List[Tag]:
+async def get_tags(skip: int, limit: int, db: AsyncSession) -> List[Tag]:
     """
     The get_tags function returns a list of tags from the database.
     
     :param skip: int: Skip a number of rows in the database
     :param limit: int: Limit the number of tags returned
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: A list of tags
     :doc-author: Trelent
     """
-    return db.query(Tag).offset(skip).limit(limit).all()
+    stmt = select(Tag).offset(skip).limit(limit)
+    tags = await db.execute(stmt)
+    return tags.scalars().all()
 
 
-async def get_tag(tag_id: int, db: Session) -> Tag:
+async def get_tag(tag_id: int, db: AsyncSession) -> Tag:
     """
     The get_tag function returns a Tag object from the database.
         
     
     :param tag_id: int: Specify the id of the tag to be retrieved
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: A tag object
     :doc-author: Trelent
     """
-    return db.query(Tag).filter(Tag.id == tag_id).first()
+    stmt = select(Tag).filter_by(id=tag_id)
+    tag = await db.execute(stmt)
+    return tag.scalar_one_or_none()
 
 
-async def create_tag(body: TagModel, db: Session) -> Tag:
+async def create_tag(body: TagModel, db: AsyncSession) -> Tag:
     """
     The create_tag function creates a new tag in the database.
     
@@ -40,56 +45,56 @@ async def create_tag(body: TagModel, db: Session) -> Tag:
     
     
     :param body: TagModel: Get the name of the tag from the request body
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: A tag object
     :doc-author: Trelent
     """
     tag = Tag(name=body.name)
     db.add(tag)
-    db.commit()
-    db.refresh(tag)
+    await db.flush()
+    await db.refresh(tag)
     return tag
 
 
-async def update_tag(tag_id: int, body: TagModel, db: Session) -> Tag | None:
+async def update_tag(tag_id: int, body: TagModel, db: AsyncSession) -> Tag | None:
     """
     The update_tag function updates a tag in the database.
         Args:
             tag_id (int): The id of the tag to update.
             body (TagModel): The updated TagModel object with new values for name and description.
-            db (Session): A Session instance used to query the database.
+            db (AsyncSession): A Session instance used to query the database.
         Returns:
             Tag | None: If successful, returns an updated Tag object; otherwise, returns None.
     
     :param tag_id: int: Identify which tag to update
     :param body: TagModel: Pass the new tag name to the function
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: The updated tag
     :doc-author: Trelent
     """
-    tag = db.query(Tag).filter(Tag.id == tag_id).first()
+    tag = await get_tag(tag_id, db)
     if tag:
         tag .name = body.name
-        db.commit()
+        await db.flush()
     return tag
 
 
-async def remove_tag(tag_id: int, db: Session) -> Tag | None:
+async def remove_tag(tag_id: int, db: AsyncSession) -> Tag | None:
     """
     The remove_tag function removes a tag from the database.
         Args:
             tag_id (int): The id of the tag to be removed.
-            db (Session): A connection to the database.
+            db (AsyncSession): A connection to the database.
         Returns:
             Tag | None: The deleted Tag object or None if no such object exists.
     
     :param tag_id: int: Identify the tag to be deleted
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: The tag that was removed from the database
     :doc-author: Trelent
     """
-    tag = db.query(Tag).filter(Tag.id == tag_id).first()
+    tag = await get_tag(tag_id, db)
     if tag:
-        db.delete(tag)
-        db.commit()
+        await db.delete(tag)
+        await db.flush()
     return tag
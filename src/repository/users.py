@@ -1,30 +1,35 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
 from libgravatar import Gravatar
 from src.database.models import User
 from src.schemas import UserModel
+from src.services.user_cache import mark_user_changed
 
 
-async def get_user_by_email(email, db: Session) -> User | None:
+async def get_user_by_email(email, db: AsyncSession) -> User | None:
     """
     The get_user_by_email function takes in an email and a database session,
     and returns the user associated with that email. If no such user exists,
     it returns None.
     
     :param email: Filter the database and find a user with that email
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: The first user with the given email
     :doc-author: Trelent
     """
-    return db.query(User).filter_by(email=email).first()
+    stmt = select(User).filter_by(email=email)
+    user = await db.execute(stmt)
+    return user.scalar_one_or_none()
 
 
-async def create_user(body: UserModel, db: Session):
+async def create_user(body: UserModel, db: AsyncSession):
     """
     The create_user function creates a new user in the database.
         
     
     :param body: UserModel: Pass the user data to the function
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: A user object
     :doc-author: Trelent
     """
@@ -39,59 +44,84 @@ async def create_user(body: UserModel, db: Session):
         roles=["user"],
     )
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.flush()
+    await db.refresh(new_user)
     return new_user
 
 
-async def update_avatar(email, url: str, db: Session) -> User:
+async def update_avatar(email, url: str, db: AsyncSession) -> User:
     """
     The update_avatar function updates the avatar of a user.
     
     Args:
         email (str): The email address of the user to update.
         url (str): The URL for the new avatar image.
-        db (Session, optional): A database session object to use instead of creating one locally. Defaults to None.  # noQA: E501 line too long
+        db (AsyncSession, optional): A database session object to use instead of creating one locally. Defaults to None.  # noQA: E501 line too long
     
     :param email: Find the user in the database
     :param url: str: Specify the type of data that will be passed into the function
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: The user object with the updated avatar url
     :doc-author: Trelent
     """
     user = await get_user_by_email(email, db)
     user.avatar = url
-    db.commit()
+    await db.flush()
+    mark_user_changed(db, email)
     return user
 
 
-async def update_token(user: User, refresh_token, db: Session):
+async def update_token(user: User, refresh_token, db: AsyncSession):
     """
     The update_token function updates the user's refresh token in the database.
         Args:
             user (User): The User object to update.
             refresh_token (str): The new refresh token for this user.
-            db (Session): A database session to use for updating the User object.
+            db (AsyncSession): A database session to use for updating the User object.
     
     :param user: User: Find the user in the database
     :param refresh_token: Update the refresh_token in the database
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: A user object
     :doc-author: Trelent
     """
     user.refresh_token = refresh_token
-    db.commit()
+    await db.flush()
+    mark_user_changed(db, user.email)
 
 
-async def confirmed_email(email: str, db: Session) -> None:
+async def revoke_tokens(user: User, db: AsyncSession) -> None:
+    """
+    The revoke_tokens function drops the user's refresh token and increments token_version,
+    so access tokens issued before are rejected by get_current_user.
+
+    :param user: User: The user whose tokens are revoked
+    :param db: AsyncSession: Pass the database session to the function
+    :return: None
+    :doc-author: Trelent
+    """
+    stmt = (
+        update(User)
+        .where(User.id == user.id)
+        .values(refresh_token=None, token_version=User.token_version + 1)
+        .returning(User.token_version)
+    )
+    # the row is already written, keep the loaded user in sync without flushing it again
+    set_committed_value(user, "token_version", (await db.execute(stmt)).scalar_one())
+    set_committed_value(user, "refresh_token", None)
+    mark_user_changed(db, user.email)
+
+
+async def confirmed_email(email: str, db: AsyncSession) -> None:
     """
     The confirmed_email function sets the confirmed field of a user to True.
     
     :param email: str: Get the email of the user
-    :param db: Session: Pass in the database session
+    :param db: AsyncSession: Pass in the database session
     :return: None
     :doc-author: Trelent
     """
     user = await get_user_by_email(email, db)
     user.confirmed = True
-    db.commit()
+    await db.flush()
+    mark_user_changed(db, email)
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+
+from src.database.models import Role
+from src.database.db import pool_status
+from src.services.auth import verified_tokens
+from src.services.passwords import password_pool
+from src.services.roles import RoleAccess
+from src.services.user_cache import local_users
+
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+allowed_operation_metrics = RoleAccess([Role.admin])
+
+
+@router.get(
+    "/metrics",
+    dependencies=[Depends(allowed_operation_metrics)],
+    description="Only admin",
+)
+async def read_metrics():
+    """
+    The read_metrics function returns live runtime metrics of the application.
+    The database section holds checked-out, idle and overflow connection counts
+    together with a histogram of the time spent waiting for a pooled connection.
+    The user_cache section holds the size and hit/miss counters of the in-process user cache.
+    The access_tokens section holds the size and hit/miss counters of the verified token cache.
+    The password_hashing section holds the bcrypt worker pool size, the queued calls and
+    a histogram of the time they waited for a worker.
+
+    :return: A dictionary with the current metrics
+    :doc-author: Trelent
+    """
+    return {
+        "database": pool_status(),
+        "user_cache": local_users.stats(),
+        "access_tokens": verified_tokens.stats(),
+        "password_hashing": password_pool.stats(),
+    }
@@ -14,18 +14,18 @@ from fastapi.security import (
     HTTPAuthorizationCredentials,
     HTTPBearer,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.services.e_mail import send_email
 from src.schemas import UserModel, UserResponse, TokenModel, RequestEmail
 
-from src.database.db import get_db
+from src.database.db import get_db, TransactionalRoute
 from src.repository import users as repository_users
 from src.services.auth import auth_servise
 
 
 # hash_handler = Hash()
 security = HTTPBearer()
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=TransactionalRoute)
 
 
 @router.post(
@@ -35,7 +35,7 @@ async def signup(
     body: UserModel,
     background_tasks: BackgroundTasks,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     The signup function creates a new user in the database.
@@ -43,7 +43,7 @@ async def signup(
     :param body: UserModel: Get the data from the request body
     :param background_tasks: BackgroundTasks: Add a task to the background tasks queue
     :param request: Request: Get the base_url of the request
-    :param db: Session: Get the database session
+    :param db: AsyncSession: Get the database session
     :param : Pass the user's email to the function
     :return: A userresponse object
     :doc-author: Trelent
@@ -53,7 +53,7 @@ async def signup(
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT, detail="Account already exists"
         )
-    body.password = auth_servise.get_password_hash(body.password)
+    body.password = await auth_servise.get_password_hash_async(body.password)
     new_user = await repository_users.create_user(body, db)
 
     background_tasks.add_task(
@@ -71,13 +71,13 @@ async def signup(
 
 @router.post("/login", response_model=TokenModel)
 async def login(
-    body: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+    body: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_db)
 ):
     """
     The login function is used to authenticate a user.
     
     :param body: OAuth2PasswordRequestForm: Get the data from the request body
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: A dict, which is a json object
     :doc-author: Trelent
     """
@@ -87,7 +87,7 @@ async def login(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="401 UNAUTHORIZED Invalid email",
         )
-    if not auth_servise.verify_password(body.password, user.password):
+    if not await auth_servise.verify_password_async(body.password, user.password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="401 UNAUTHORIZED Invalid password",
@@ -98,7 +98,7 @@ async def login(
         )
 
     # Generate JWT
-    access_token = await auth_servise.create_access_token(data={"sub": user.email})
+    access_token = await auth_servise.create_access_token(data={"sub": user.email}, user=user)
     refresh_token = await auth_servise.create_refresh_token(data={"sub": user.email})
     await repository_users.update_token(user, refresh_token, db)
 
@@ -110,15 +110,15 @@ async def login(
 
 
 @router.get("/confirmed_email/{token}")
-async def confirmed_email(token: str, db: Session = Depends(get_db)):
+async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     """
     The confirmed_email function confirms the user's email address.
         Args:
             token (str): The JWT token that was sent to the user's email address.
-            db (Session, optional): SQLAlchemy Session. Defaults to Depends(get_db).
+            db (AsyncSession, optional): SQLAlchemy AsyncSession. Defaults to Depends(get_db).
     
     :param token: str: Get the token from the url
-    :param db: Session: Pass the database connection to the function
+    :param db: AsyncSession: Pass the database connection to the function
     :return: The following error:
     :doc-author: Trelent
     """
@@ -137,7 +137,7 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
 @router.get("/refresh_token", response_model=TokenModel)
 async def refresh_token(
     credentials: HTTPAuthorizationCredentials = Security(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     The refresh_token function is used to refresh the access token.
@@ -145,7 +145,7 @@ async def refresh_token(
         a new refresh_token, and the type of token (bearer).
     
     :param credentials: HTTPAuthorizationCredentials: Get the token from the request header
-    :param db: Session: Get the database session, and the credentials: httpauthorizationcredentials parameter is used to get the token from http headers
+    :param db: AsyncSession: Get the database session, and the credentials: httpauthorizationcredentials parameter is used to get the token from http headers
     :param : Get the user's credentials from the request header
     :return: A dictionary with access_token, refresh_token and token_type
     :doc-author: Trelent
@@ -154,12 +154,15 @@ async def refresh_token(
     email = await auth_servise.decode_refresh_token(token)
     user = await repository_users.get_user_by_email(email, db)
     if user.refresh_token != token:
-        await repository_users.update_token(user, None, db)
+        # a reused refresh token may be stolen, revoke every token of the user
+        await repository_users.revoke_tokens(user, db)
+        # the revoked tokens must be persisted even though the request fails
+        await db.commit()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
         )
 
-    access_token = await auth_servise.create_access_token(data={"sub": email})
+    access_token = await auth_servise.create_access_token(data={"sub": email}, user=user)
     refresh_token = await auth_servise.create_refresh_token(data={"sub": email})
     await repository_users.update_token(user, refresh_token, db)
     return {
@@ -174,7 +177,7 @@ async def request_email(
     body: RequestEmail,
     background_tasks: BackgroundTasks,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     The request_email function is used to send an email to the user with a link
@@ -186,7 +189,7 @@ async def request_email(
     :param body: RequestEmail: Get the email from the request body
     :param background_tasks: BackgroundTasks: Add a task to the background tasks queue
     :param request: Request: Get the base_url of the server
-    :param db: Session: Get the database session
+    :param db: AsyncSession: Get the database session
     :param : Get the user's email, username and request
     :return: A dict with a message
     :doc-author: Trelent
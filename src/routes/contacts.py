@@ -1,23 +1,54 @@
-from typing import List
+from typing import List, Literal, Tuple
 
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, Body, HTTPException, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from fastapi_limiter.depends import RateLimiter
 
-from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models import Role, User
-from src.database.db import get_db
+from src.conf.config import settings
+from src.database.models import Role
+from src.database.db import get_db, get_read_db, TransactionalRoute
 from src.schemas import (
     ContactModel,
     ContactUpdate,
+    ContactPatch,
+    ContactBatchUpdate,
+    ContactBatchResult,
+    ContactBatchResponse,
     ContactResponse,
+    ContactSearchResult,
+    ContactImportReport,
+    ContactImportError,
 )
 from src.repository import contacts as repository_contacts
-from src.services.auth import auth_servise
 from src.services.roles import RoleAccess
+from src.services.bulk import (
+    CSV_TYPES,
+    NDJSON_TYPES,
+    iter_csv_records,
+    iter_ndjson_records,
+    format_csv,
+    format_ndjson,
+)
+from src.services.serializers import item_response, list_response, parse_fields, partial_model
+from src.services.conditional import (
+    contact_etag,
+    list_etag,
+    http_date,
+    is_conditional,
+    not_modified,
+)
+from src.services.pagination import (
+    encode_cursor,
+    decode_cursor,
+    encode_rank_cursor,
+    decode_rank_cursor,
+)
 
 
-router = APIRouter(prefix="/contacts", tags=["contacts"])
+router = APIRouter(prefix="/contacts", tags=["contacts"], route_class=TransactionalRoute)
 
 allowed_operation_get = RoleAccess([Role.admin, Role.moderator, Role.user])
 allowed_operation_create = RoleAccess([Role.admin, Role.moderator, Role.user])
@@ -25,6 +56,25 @@ allowed_operation_update = RoleAccess([Role.admin, Role.moderator])
 allowed_operation_remove = RoleAccess([Role.admin])
 
 
+def contact_fields(
+    fields: str | None = Query(None, description="Comma-separated response fields, e.g. name,e_mail"),
+) -> Tuple[str, ...] | None:
+    """
+    The contact_fields dependency parses the sparse fieldset requested with ?fields=.
+        The id field is always returned.
+
+    :param fields: str | None: The raw query parameter
+    :return: The selected ContactResponse fields or None for all of them
+    :doc-author: Trelent
+    """
+    if fields is None:
+        return None
+    try:
+        return parse_fields(fields, ContactResponse)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get(
     "/",
     response_model=List[ContactResponse],
@@ -35,10 +85,14 @@ allowed_operation_remove = RoleAccess([Role.admin])
     description="No more than 10 requests per minute",
 )
 async def read_contacts(
+    request: Request,
+    response: Response,
     skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth_servise.get_current_user),
+    limit: int = Query(100, ge=1, le=settings.max_page_size),
+    after: str | None = None,
+    total: Literal["exact", "estimate"] | None = None,
+    selected: Tuple[str, ...] | None = Depends(contact_fields),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     The read_contacts function returns a list of contacts.
@@ -52,18 +106,161 @@ async def read_contacts(
               name: skip (optional)  # The name parameter is the variable that will be used to pass the value into the function. In this case, it's called &quot;skip&quot;. It's also possible to use an alias for this parameter by using &quot;name&quot; and then specifying an alternative name with &quot;as&quot;. For example, you could use `name=skip&amp;amp;as=offset
 
 
+    :param request: Request: Read the If-None-Match header
+    :param response: Response: Set the X-Next-Cursor, X-Total-Count and ETag headers
     :param skip: int: Skip the first n contacts
-    :param limit: int: Limit the number of contacts returned
-    :param db: Session: Pass the database session to the function
-    :param current_user: User: Get the user who is currently logged in
+    :param limit: int: Limit the number of contacts returned, at most settings.max_page_size
+    :param after: str: The X-Next-Cursor value of the previous page
+    :param total: str: Send X-Total-Count, either an exact count (cached, at most settings.total_count_ttl seconds old if Redis is down) or the planner's estimate
+    :param selected: Tuple[str, ...] | None: The fields requested with ?fields=
+    :param db: AsyncSession: Pass the database session to the function
     :param : Get the current user from the database
     :return: A list of contacts
     :doc-author: Trelent
     """
-    contacts = await repository_contacts.get_contacts(skip, limit, db)
+    try:
+        key = decode_cursor(after) if after else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    if total == "exact":
+        response.headers["X-Total-Count"] = str(await repository_contacts.count_contacts(db))
+    elif total == "estimate":
+        response.headers["X-Total-Count"] = str(await repository_contacts.estimate_contacts(db))
+    if is_conditional(request):
+        versions = await repository_contacts.get_contacts_versions(skip, limit, db, after=key)
+        etag = list_etag((row["id"], row["version"]) for row in versions)
+        if not_modified(request, etag):
+            headers = {"ETag": etag}
+            if "X-Total-Count" in response.headers:
+                headers["X-Total-Count"] = response.headers["X-Total-Count"]
+            if len(versions) == limit:
+                last = versions[-1]
+                headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    contacts = await repository_contacts.get_contacts(skip, limit, db, after=key, fields=selected)
+    response.headers["ETag"] = list_etag((row["id"], row["version"]) for row in contacts)
+    if len(contacts) == limit:
+        last = contacts[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last["created_at"], last["id"])
+    if selected:
+        return list_response(partial_model(ContactResponse, selected), contacts, response)
+    if settings.precompiled_serializers:
+        return list_response(ContactResponse, contacts, response)
+    return contacts
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(allowed_operation_get), Depends(RateLimiter(times=2, seconds=60))],
+    description="Streams all contacts as NDJSON or CSV",
+)
+async def export_contacts(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    The export_contacts function streams every contact to the client.
+        Rows are read through a server-side cursor in batches of settings.export_batch_size
+        and every batch is written to the response as soon as it arrives, so memory use
+        does not grow with the size of the table.
+
+    :param format: str: ndjson or csv
+    :param db: AsyncSession: Pass the database session to the repository layer
+    :return: A streaming response
+    :doc-author: Trelent
+    """
+    fields = list(ContactResponse.model_fields)
+
+    async def content():
+        first = True
+        async for rows in repository_contacts.stream_contacts(db, settings.export_batch_size):
+            if format == "csv":
+                yield format_csv(rows, fields, header=first)
+            else:
+                yield format_ndjson(rows)
+            first = False
+        if first and format == "csv":
+            yield format_csv([], fields, header=True)
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        content(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="contacts.{format}"'},
+    )
+
+
+@router.get(
+    "/fts",
+    response_model=List[ContactSearchResult],
+    dependencies=[Depends(allowed_operation_get)],
+)
+async def full_text_search(
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=settings.max_page_size),
+    after: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    The full_text_search function searches contacts by free text over name, last name,
+        e-mail and description. Matches are ranked by relevance and the description is
+        returned as a headline with the matched words wrapped in <mark> tags.
+        The headline is HTML: the description is escaped and <mark> is its only markup.
+
+    :param response: Response: Set the X-Next-Cursor header
+    :param q: str: The search query, web-search syntax
+    :param limit: int: Limit the number of matches returned
+    :param after: str: The X-Next-Cursor value of the previous page
+    :param db: AsyncSession: Pass the database session to the repository layer
+    :return: A list of ranked contacts
+    :doc-author: Trelent
+    """
+    try:
+        key = decode_rank_cursor(after) if after else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    contacts = await repository_contacts.full_text_search(q, limit, db, after=key)
+    if len(contacts) == limit:
+        last = contacts[-1]
+        response.headers["X-Next-Cursor"] = encode_rank_cursor(last["rank"], last["id"])
     return contacts
 
 
+@router.get(
+    "/batch",
+    response_model=ContactBatchResponse,
+    dependencies=[Depends(allowed_operation_get)],
+)
+async def read_contacts_batch(
+    ids: List[int] = Query([], max_length=settings.max_batch_size),
+    db: AsyncSession = Depends(get_read_db),
+):
+    """
+    The read_contacts_batch function resolves a list of contact ids with one query.
+        Contacts are returned in the order of the requested ids, and ids
+        that do not exist are listed under missing.
+
+    :param ids: List[int]: The ids of the contacts to load
+    :param db: AsyncSession: Pass the database connection to the function.
+    :return: The found contacts and the missing ids
+    :doc-author: Trelent
+    """
+    if not ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No ids given"
+        )
+    contacts = await repository_contacts.get_contacts_by_ids(ids, db)
+    found = {contact.id for contact in contacts}
+    missing = [id for id in dict.fromkeys(ids) if id not in found]
+    return {"contacts": contacts, "missing": missing}
+
+
 @router.get(
     "/{contact_id}",
     response_model=ContactResponse,
@@ -71,29 +268,50 @@ async def read_contacts(
 )
 async def read_contact(
     contact_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth_servise.get_current_user),
+    request: Request,
+    response: Response,
+    selected: Tuple[str, ...] | None = Depends(contact_fields),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
-    The read_contacts function returns a list of contacts.
+    The read_contact function returns a single contact with its ETag and Last-Modified headers.
+        Conditional requests are answered from the contact's version alone and get
+        304 Not Modified while the client's copy is current.
 
-    :param skip: int: Number of contacts to skip (default is 0).
-    :param limit: int: Number of contacts to retrieve (default is 10).
-    :param db: Session: Pass the database connection to the function.
-    :param current_user: User: Get the current user from the database.
+    :param contact_id: int: The id of the contact.
+    :param request: Request: Read the If-None-Match and If-Modified-Since headers.
+    :param response: Response: Set the ETag and Last-Modified headers.
+    :param selected: Tuple[str, ...] | None: The fields requested with ?fields=.
+    :param db: AsyncSession: Pass the database connection to the function.
 
-    :return: A list of contacts.
-    :rtype: List[Contact]
+    :return: The contact.
+    :rtype: Contact
 
-    :raises HTTPException 404: If the contacts are not found.
+    :raises HTTPException 404: If the contact is not found.
 
     :doc-author: Trelent
     """
-    contact = await repository_contacts.get_contact(contact_id, db)
+    if is_conditional(request):
+        version = await repository_contacts.get_contact_version(contact_id, db)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
+            )
+        headers = {
+            "ETag": contact_etag(contact_id, version.version),
+            "Last-Modified": http_date(version.updated_at),
+        }
+        if not_modified(request, headers["ETag"], version.updated_at):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    contact = await repository_contacts.get_contact_row(contact_id, db, fields=selected)
     if contact is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
         )
+    response.headers["ETag"] = contact_etag(contact_id, contact["version"])
+    response.headers["Last-Modified"] = http_date(contact["updated_at"])
+    if selected:
+        return item_response(partial_model(ContactResponse, selected), contact, response)
     return contact
 
 
@@ -106,8 +324,10 @@ async def search_contact(
     name: str = None,
     last_name: str = None,
     e_mail: str = None,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth_servise.get_current_user),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=settings.max_page_size),
+    selected: Tuple[str, ...] | None = Depends(contact_fields),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     The search_contact function searches for a contact in the database.
@@ -119,18 +339,26 @@ async def search_contact(
     :param name: str: Search for a contact by name
     :param last_name: str: Search for a contact by last name
     :param e_mail: str: Search for a contact by e-mail
-    :param db: Session: Pass the database session to the repository layer
-    :param current_user: User: Get the current user
+    :param skip: int: Skip the first n matches
+    :param limit: int: Limit the number of matches returned
+    :param selected: Tuple[str, ...] | None: The fields requested with ?fields=
+    :param db: AsyncSession: Pass the database session to the repository layer
     :param : Get the data from the database
     :return: A list of contacts
     :doc-author: Trelent
 
     """
-    contact = await repository_contacts.search_contacts(name, last_name, e_mail, db)
+    contact = await repository_contacts.search_contacts(
+        name, last_name, e_mail, db, skip=skip, limit=limit, fields=selected
+    )
     if contact is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
         )
+    if selected:
+        return list_response(partial_model(ContactResponse, selected), contact)
+    if settings.precompiled_serializers:
+        return list_response(ContactResponse, contact)
     return contact
 
 
@@ -140,25 +368,27 @@ async def search_contact(
     dependencies=[Depends(allowed_operation_get)],
 )
 async def read_upcoming_birthdays(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth_servise.get_current_user),
+    days: int = Query(7, ge=1, le=365),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     The read_upcoming_birthdays function returns a list of contacts with upcoming birthdays.
         The function is called by the read_upcoming_birthdays endpoint, which is defined in the app/main.py file.
    
-    :param db: Session: Pass the database session to the function
-    :param current_user: User: Get the currently logged in user
+    :param days: int: The length of the window in days, 7 by default
+    :param db: AsyncSession: Pass the database session to the function
     :param : Pass the database session to the function
     :return: A list of contacts
     :doc-author: Trelent
 
     """
-    contacts = await repository_contacts.get_upcoming_birthdays(db)
+    contacts = await repository_contacts.get_upcoming_birthdays(db, days)
     if contacts is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contacts not found"
         )
+    if settings.precompiled_serializers:
+        return list_response(ContactResponse, contacts)
     return contacts
 
 
@@ -170,16 +400,14 @@ async def read_upcoming_birthdays(
 )
 async def create_contact(
     body: ContactModel,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth_servise.get_current_user)):
+    db: AsyncSession = Depends(get_db)):
     """
     The create_contact function creates a new contact in the database.
         The function takes a ContactModel object as input and returns the newly created contact.
    
    
     :param body: ContactModel: Get the data from the request body
-    :param db: Session: Pass the database session to the function
-    :param current_user: User: Get the user that is currently logged in
+    :param db: AsyncSession: Pass the database session to the function
     :return: A contactmodel object
     :doc-author: Trelent
 
@@ -187,6 +415,120 @@ async def create_contact(
     return await repository_contacts.create_contact(body, db)
 
 
+@router.post(
+    "/import",
+    response_model=ContactImportReport,
+    dependencies=[Depends(allowed_operation_create), Depends(RateLimiter(times=2, seconds=60))],
+    description="Streamed CSV (text/csv) or NDJSON (application/x-ndjson) body",
+)
+async def import_contacts(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    The import_contacts function imports contacts from a streamed CSV or NDJSON request body.
+        Rows are validated with ContactModel while the body is being received and valid rows are
+        written in batches of settings.import_chunk_size with one multi-row INSERT per batch.
+        Invalid rows are skipped and reported with their row number; rows whose e-mail
+        is already taken are skipped and counted.
+
+    :param request: Request: Read the request body as a stream
+    :param db: AsyncSession: Pass the database session to the repository layer
+    :return: An import report with the number of imported, skipped and failed rows
+    :doc-author: Trelent
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in CSV_TYPES:
+        records = iter_csv_records(request.stream())
+    elif content_type in NDJSON_TYPES:
+        records = iter_ndjson_records(request.stream())
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Expected text/csv or application/x-ndjson",
+        )
+
+    report = ContactImportReport()
+    chunk = []
+    async for row, record in records:
+        try:
+            if isinstance(record, str):
+                raise ValueError(record)
+            chunk.append(ContactModel(**record))
+        except (ValidationError, ValueError) as e:
+            report.failed += 1
+            if len(report.errors) >= settings.import_max_errors:
+                report.errors_truncated = True
+                continue
+            if isinstance(e, ValidationError):
+                messages = [
+                    f"{'.'.join(map(str, error['loc']))}: {error['msg']}"
+                    for error in e.errors()
+                ]
+            else:
+                messages = [str(e)]
+            report.errors.append(ContactImportError(row=row, errors=messages))
+            continue
+        if len(chunk) >= settings.import_chunk_size:
+            await _import_chunk(chunk, report, db)
+            chunk = []
+    await _import_chunk(chunk, report, db)
+    return report
+
+
+async def _import_chunk(chunk: List[ContactModel], report: ContactImportReport, db: AsyncSession):
+    imported = await repository_contacts.create_contacts(chunk, db)
+    report.imported += imported
+    report.skipped += len(chunk) - imported
+
+
+@router.put(
+    "/upsert",
+    response_model=ContactResponse,
+    dependencies=[Depends(allowed_operation_update)],
+    description="Only moderator and admin",
+)
+async def upsert_contact(
+    body: ContactModel,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    The upsert_contact function creates a contact or, if a contact with the same
+        e-mail (compared case-insensitively) exists, replaces its fields, in one statement.
+   
+    :param body: ContactModel: The contact to create or update
+    :param db: AsyncSession: Pass the database session to the repository
+    :return: The created or updated contact
+    :doc-author: Trelent
+
+    """
+    contacts = await repository_contacts.upsert_contacts([body], db)
+    return contacts[0]
+
+
+@router.put(
+    "/upsert/batch",
+    response_model=List[ContactResponse],
+    dependencies=[Depends(allowed_operation_update)],
+    description="Only moderator and admin",
+)
+async def upsert_contacts(
+    body: List[ContactModel] = Body(min_length=1, max_length=settings.max_batch_size),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    The upsert_contacts function creates or updates a list of contacts matched by e-mail
+        with one INSERT ... ON CONFLICT DO UPDATE statement.
+   
+    :param body: List[ContactModel]: The contacts to create or update
+    :param db: AsyncSession: Pass the database session to the repository
+    :return: The created or updated contacts, one per distinct e-mail
+    :doc-author: Trelent
+
+    """
+    return await repository_contacts.upsert_contacts(body, db)
+
+
 @router.put(
     "/{contact_id}",
     response_model=ContactResponse,
@@ -196,8 +538,7 @@ async def create_contact(
 async def update_contact(
     body: ContactUpdate,
     contact_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth_servise.get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     The update_contact function updates a contact in the database.
@@ -206,8 +547,7 @@ async def update_contact(
    
     :param body: ContactUpdate: Get the data from the request body
     :param contact_id: int: Identify the contact to be updated
-    :param db: Session: Pass the database session to the repository
-    :param current_user: User: Check if the user is logged in
+    :param db: AsyncSession: Pass the database session to the repository
     :param : Get the contact id from the url
     :return: A contactupdate object
     :doc-author: Trelent
@@ -221,6 +561,93 @@ async def update_contact(
     return contact
 
 
+@router.patch(
+    "/batch",
+    response_model=List[ContactBatchResult],
+    dependencies=[Depends(allowed_operation_update)],
+    description="Only moderator and admin",
+)
+async def update_contacts(
+    body: ContactBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    The update_contacts function applies the same changes to a list of contacts
+        in one statement and reports the outcome for every requested id.
+   
+    :param body: ContactBatchUpdate: The ids to update and the fields to change
+    :param db: AsyncSession: Pass the database session to the repository
+    :return: A list of per-id outcomes
+    :doc-author: Trelent
+
+    """
+    updated = set(await repository_contacts.update_contacts(body.ids, body.changes, db))
+    return [
+        ContactBatchResult(id=id, status="updated" if id in updated else "not_found")
+        for id in dict.fromkeys(body.ids)
+    ]
+
+
+@router.patch(
+    "/{contact_id}",
+    response_model=ContactResponse,
+    dependencies=[Depends(allowed_operation_update)],
+    description="Only moderator and admin",
+)
+async def patch_contact(
+    body: ContactPatch,
+    contact_id: int,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    The patch_contact function changes only the fields present in the request body.
+        If no contact is found with that id, it raises an HTTP 404 error.
+   
+    :param body: ContactPatch: The fields to change
+    :param contact_id: int: Identify the contact to be updated
+    :param db: AsyncSession: Pass the database session to the repository
+    :return: The updated contact
+    :doc-author: Trelent
+
+    """
+    contact = await repository_contacts.patch_contact(contact_id, body, db)
+    if contact is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
+        )
+    return contact
+
+
+@router.delete(
+    "/batch",
+    response_model=List[ContactBatchResult],
+    dependencies=[Depends(allowed_operation_remove)],
+)
+async def remove_contacts(
+    ids: List[int] = Query([], max_length=settings.max_batch_size),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    The remove_contacts function deletes a list of contacts in one statement
+        and reports the outcome for every requested id.
+   
+    :param ids: List[int]: The ids of the contacts to delete
+    :param db: AsyncSession: Pass the database session to the repository
+    :return: A list of per-id outcomes
+    :doc-author: Trelent
+
+    """
+    if not ids:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="No ids given"
+        )
+    deleted = set(await repository_contacts.remove_contacts(ids, db))
+    return [
+        ContactBatchResult(id=id, status="deleted" if id in deleted else "not_found")
+        for id in dict.fromkeys(ids)
+    ]
+
+
 @router.delete(
     "/{contact_id}",
     response_model=ContactResponse,
@@ -228,19 +655,16 @@ async def update_contact(
 )
 async def remove_contact(
     contact_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth_servise.get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     The remove_contact function removes a contact from the database.
         Args:
             contact_id (int): The id of the contact to remove.
-            db (Session, optional): SQLAlchemy Session. Defaults to Depends(get_db).
-            current_user (User, optional): User object for authentication and authorization purposes. Defaults to Depends(auth_servise.get_current_user).
+            db (AsyncSession, optional): SQLAlchemy AsyncSession. Defaults to Depends(get_db).
    
     :param contact_id: int: Pass the contact_id to the function
-    :param db: Session: Get the database session
-    :param current_user: User: Get the user information from the token
+    :param db: AsyncSession: Get the database session
     :param : Get the id of the contact to be removed
     :return: The contact object that was deleted
     :doc-author: Trelent
@@ -1,17 +1,17 @@
 from typing import List
 
 from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db, TransactionalRoute
 from src.schemas import TagModel, TagResponse
 from src.repository import tags as repository_tags
 
-router = APIRouter(prefix='/tags', tags=["tags"])
+router = APIRouter(prefix='/tags', tags=["tags"], route_class=TransactionalRoute)
 
 
 @router.get("/", response_model=List[TagResponse])
-async def read_tags(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+async def read_tags(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_read_db)):
     """
     The read_tags function returns a list of tags.
         ---
@@ -24,7 +24,7 @@ async def read_tags(skip: int = 0, limit: int = 100, db: Session = Depends(get_d
     
     :param skip: int: Skip the first n tags
     :param limit: int: Limit the number of tags returned
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: A list of tags
     :doc-author: Trelent
     """
@@ -33,12 +33,12 @@ async def read_tags(skip: int = 0, limit: int = 100, db: Session = Depends(get_d
 
 
 @router.get("/{tag_id}", response_model=TagResponse)
-async def read_tag(tag_id: int, db: Session = Depends(get_db)):
+async def read_tag(tag_id: int, db: AsyncSession = Depends(get_read_db)):
     """
     The read_tag function returns a single tag from the database.
     
     :param tag_id: int: Specify the tag id to be returned
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: A tag object, which is a pydantic model
     :doc-author: Trelent
     """
@@ -50,13 +50,13 @@ async def read_tag(tag_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/", response_model=TagResponse)
-async def create_tag(body: TagModel, db: Session = Depends(get_db)):
+async def create_tag(body: TagModel, db: AsyncSession = Depends(get_db)):
     """
     The create_tag function creates a new tag in the database.
         The function takes a TagModel object as input and returns the newly created tag.
     
     :param body: TagModel: Specify the type of data that will be passed to the function
-    :param db: Session: Pass the database session to the repository layer
+    :param db: AsyncSession: Pass the database session to the repository layer
     :return: A tagmodel object
     :doc-author: Trelent
     """
@@ -64,7 +64,7 @@ async def create_tag(body: TagModel, db: Session = Depends(get_db)):
 
 
 @router.put("/{tag_id}", response_model=TagResponse)
-async def update_tag(body: TagModel, tag_id: int, db: Session = Depends(get_db)):
+async def update_tag(body: TagModel, tag_id: int, db: AsyncSession = Depends(get_db)):
     """
     The update_tag function updates a tag in the database.
         The function takes an id and a body as input, and returns the updated tag.
@@ -72,7 +72,7 @@ async def update_tag(body: TagModel, tag_id: int, db: Session = Depends(get_db))
     
     :param body: TagModel: Get the data from the request body
     :param tag_id: int: Find the tag in the database
-    :param db: Session: Pass the database session to the repository layer
+    :param db: AsyncSession: Pass the database session to the repository layer
     :return: A tagmodel object
     :doc-author: Trelent
     """
@@ -84,17 +84,17 @@ async def update_tag(body: TagModel, tag_id: int, db: Session = Depends(get_db))
 
 
 @router.delete("/{tag_id}", response_model=TagResponse)
-async def remove_tag(tag_id: int, db: Session = Depends(get_db)):
+async def remove_tag(tag_id: int, db: AsyncSession = Depends(get_db)):
     """
     The remove_tag function removes a tag from the database.
         Args:
             tag_id (int): The id of the tag to be removed.
-            db (Session, optional): SQLAlchemy Session. Defaults to Depends(get_db).
+            db (AsyncSession, optional): SQLAlchemy AsyncSession. Defaults to Depends(get_db).
         Returns:
             Tag: The deleted Tag object.
     
     :param tag_id: int: Specify the id of the tag to be deleted
-    :param db: Session: Pass the database session to the function
+    :param db: AsyncSession: Pass the database session to the function
     :return: The tag that was removed
     :doc-author: Trelent
     """
@@ -3,9 +3,9 @@ import cloudinary
 import cloudinary.uploader
 
 from fastapi import APIRouter, Depends, status, UploadFile, File
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db import get_db
+from src.database.db import get_db, TransactionalRoute
 from src.database.models import User
 from src.repository import users as repository_users
 from src.services.auth import auth_servise
@@ -13,7 +13,7 @@ from src.services.cloud_image import CloudImage
 from src.conf.config import settings
 from src.schemas import UserResponse
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=TransactionalRoute)
 
 
 @router.get("/me/", response_model=UserResponse)
@@ -30,17 +30,17 @@ async def read_users_me(current_user: User = Depends(auth_servise.get_current_us
 
 @router.patch('/avatar', response_model=UserResponse)
 async def update_avatar_user(file: UploadFile = File(), current_user: User = Depends(auth_servise.get_current_user),
-                             db: Session = Depends(get_db)):
+                             db: AsyncSession = Depends(get_db)):
     """
     The update_avatar_user function updates the avatar of a user.
         Args:
             file (UploadFile): The file to upload.
             current_user (User): The currently logged in user, which is passed by the auth_servise dependency.
-            db (Session): A database session instance, which is passed by the get_db dependency.
+            db (AsyncSession): A database session instance, which is passed by the get_db dependency.
     
     :param file: UploadFile: Get the file from the request body
     :param current_user: User: Get the current user
-    :param db: Session: Access the database
+    :param db: AsyncSession: Access the database
     :return: A user
     :doc-author: Trelent
     """
@@ -1,9 +1,10 @@
 from datetime import datetime
 from datetime import date
-from typing import List, Optional
-from pydantic import BaseModel, Field, EmailStr
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, EmailStr, field_validator
 from fastapi import UploadFile
 
+from src.conf.config import settings
 from src.database.models import Role
 
 
@@ -56,8 +57,8 @@ class NoteBase(BaseModel):
 class ContactBase(BaseModel):
     name: str = Field(max_length=50)
     last_name: str = Field(max_length=50)
-    e_mail: EmailStr
-    phone_number: str = Field(max_length=20)
+    e_mail: EmailStr = Field(max_length=50)
+    phone_number: str = Field(max_length=17)
     born_date: DateModel
     description: str = Field(max_length=150)
 
@@ -78,6 +79,15 @@ class ContactUpdate(ContactModel):
     done: bool
 
 
+class ContactPatch(BaseModel):
+    name: Optional[str] = Field(None, max_length=50)
+    last_name: Optional[str] = Field(None, max_length=50)
+    e_mail: Optional[EmailStr] = Field(None, max_length=50)
+    phone_number: Optional[str] = Field(None, max_length=17)
+    born_date: Optional[date] = None
+    description: Optional[str] = Field(None, max_length=150)
+
+
 class NoteStatusUpdate(BaseModel):
     done: bool
 
@@ -105,6 +115,49 @@ class ContactResponse(ContactBase):
     description: str
 
 
+class ContactSearchResult(ContactResponse):
+    rank: float
+    headline: str = Field(
+        description="HTML fragment: the escaped description with matches wrapped in <mark> tags"
+    )
+
+
+class ContactImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class ContactImportReport(BaseModel):
+    imported: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: List[ContactImportError] = []
+    errors_truncated: bool = False
+
+
+class ContactBatchUpdate(BaseModel):
+    ids: List[int] = Field(min_length=1, max_length=settings.max_batch_size)
+    changes: ContactPatch
+
+    @field_validator("changes")
+    @classmethod
+    def e_mail_is_unique(cls, changes: ContactPatch) -> ContactPatch:
+        # e-mails are unique, one address can not be given to several contacts
+        if "e_mail" in changes.model_fields_set:
+            raise ValueError("e_mail can not be changed in a batch update")
+        return changes
+
+
+class ContactBatchResult(BaseModel):
+    id: int
+    status: Literal["updated", "deleted", "not_found"]
+
+
+class ContactBatchResponse(BaseModel):
+    contacts: List[ContactResponse]
+    missing: List[int]
+
+
 class UserResponse(BaseModel):
     id: int
     username: str
@@ -1,11 +1,17 @@
-import redis
-import pickle
+import asyncio
+import hashlib
+import logging
+import time
+import orjson
+import redis.asyncio as redis
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Iterable, Optional
 
 from fastapi import Depends, HTTPException
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from jose import JWTError, jwt
@@ -13,9 +19,35 @@ from starlette import status
 
 from src.repository import users as repository_users
 from src.database.db import get_db
+from src.database.models import User
+from src.services.cache import TTLCache
+from src.services.passwords import password_pool
+from src.services.user_cache import (
+    USER_INVALIDATION_CHANNEL,
+    local_users,
+    user_cache_key,
+    dump_user,
+    load_user,
+)
 
 from src.conf.config import settings
 
+logger = logging.getLogger(__name__)
+
+verified_tokens = TTLCache(settings.access_token_cache_size, settings.access_token_cache_ttl)
+
+
+def token_cache_key(token: str) -> bytes:
+    """
+    The token_cache_key function returns the key of a verified token in verified_tokens.
+    Tokens are hashed, so the cache does not hold usable credentials.
+
+    :param token: str: The encoded access token
+    :return: The SHA-256 digest of the token
+    :doc-author: Trelent
+    """
+    return hashlib.sha256(token.encode()).digest()
+
 
 class Auth:
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -68,25 +100,58 @@ class Auth:
         """
         return self.pwd_context.hash(password)
 
+    async def verify_password_async(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        The verify_password_async function is verify_password run in the password worker pool,
+            so the bcrypt work of a login does not block other requests on the event loop.
+
+        :param self: Represent the instance of the class
+        :param plain_password: str: The password entered by the user
+        :param hashed_password: str: The hashed password from the database
+        :return: True if the password matches, otherwise False
+        :doc-author: Trelent
+        """
+        return await password_pool.run(self.pwd_context.verify, plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """
+        The get_password_hash_async function is get_password_hash run in the password worker pool.
+
+        :param self: Represent the instance of the class
+        :param password: str: The password to hash
+        :return: A hash of the password
+        :doc-author: Trelent
+        """
+        return await password_pool.run(self.pwd_context.hash, password)
+
     # define a function to generate a new access token
     async def create_access_token(
-        self, data: dict, expires_delta: Optional[float] = None
+        self, data: dict, expires_delta: Optional[float] = None, user: Optional[User] = None
     ):
         """
         The create_access_token function creates a new access token for the user.
-            
+            When the user is given, the token carries the user's token_version, so the token
+            stops working once the user's tokens are revoked. With settings.stateless_roles on
+            it also carries the user's role, so RoleAccess can authorize without loading the user;
+            such tokens live at most settings.stateless_token_ttl seconds.
         
         :param self: Represent the instance of the class
         :param data: dict: Pass the data that will be encoded into the token
         :param expires_delta: Optional[float]: Set the expiration time of the token
+        :param user: Optional[User]: The user the token is issued to
         :return: A jwt encoded with the following claims:
         :doc-author: Trelent
         """
         to_encode = data.copy()
-        if expires_delta:
-            expire = datetime.utcnow() + timedelta(seconds=expires_delta)
-        else:
-            expire = datetime.utcnow() + timedelta(minutes=120)
+        if user is not None:
+            to_encode["ver"] = user.token_version
+            if settings.stateless_roles:
+                to_encode["role"] = user.roles.value
+        lifetime = expires_delta or 120 * 60
+        if "role" in to_encode:
+            # the role claim is trusted without loading the user, keep revoked tokens short-lived
+            lifetime = min(lifetime, settings.stateless_token_ttl)
+        expire = datetime.utcnow() + timedelta(seconds=lifetime)
         to_encode.update(
             {"iat": datetime.utcnow(), "exp": expire, "scope": "access_token"}
         )
@@ -124,17 +189,44 @@ class Auth:
         )
         return encoded_refresh_token
 
+    def decode_access_token(self, token: str) -> dict:
+        """
+        The decode_access_token function verifies an access token and returns its claims.
+            Verified claims are kept in verified_tokens until the token expires, so repeated
+            requests with the same token skip the signature check and the JSON parsing.
+            The returned claims are shared between requests and must not be modified.
+            Revoking tokens does not evict entries: a token is revoked by bumping the user's
+            token_version, which get_current_user compares with the ver claim.
+        
+        :param self: Represent the instance of a class
+        :param token: str: The encoded access token
+        :return: The claims of the token
+        :raises JWTError: If the token is invalid, expired or not an access token
+        :doc-author: Trelent
+        """
+        key = token_cache_key(token)
+        payload = verified_tokens.get(key)
+        if payload is not None:
+            return payload
+        payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+        if payload.get("scope") != "access_token":
+            raise JWTError("Invalid scope for token")
+        if "exp" in payload:
+            verified_tokens.set(key, payload, ttl=payload["exp"] - time.time())
+        return payload
+
     async def get_current_user(
-        self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+        self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
     ):
         """
         The get_current_user function is a dependency that will be used in the
             protected endpoints. It takes a token as an argument and returns the user
             object if it exists, otherwise it raises an exception.
+            Tokens issued for an older token_version of the user are rejected.
         
         :param self: Represent the instance of a class
         :param token: str: Get the token from the authorization header
-        :param db: Session: Access the database
+        :param db: AsyncSession: Access the database
         :return: A user object
         :doc-author: Trelent
         """
@@ -145,27 +237,107 @@ class Auth:
         )
 
         try:
-            # Decode JWT
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            if payload["scope"] == "access_token":
-                email = payload["sub"]
-                if email is None:
-                    raise credentials_exception
-            else:
-                raise credentials_exception
+            payload = self.decode_access_token(token)
         except JWTError as e:
             raise credentials_exception
-        user = self.r.get(f"user:{email}")
+        email = payload.get("sub")
+        if email is None:
+            raise credentials_exception
+        user = await self.get_cached_user(email)
         if user is None:
             user = await repository_users.get_user_by_email(email, db)
             if user is None:
                 raise credentials_exception
-            self.r.set(f"user:{email}", pickle.dumps(user))
-            self.r.expire(f"user:{email}", 900)
-        else:
-            user = pickle.loads(user)
+            await self.cache_user(user)
+        if "ver" in payload and payload["ver"] != user.token_version:
+            raise credentials_exception
+        return user
+
+    async def get_cached_user(self, email: str) -> User | None:
+        """
+        The get_cached_user function reads a user from the in-process cache and,
+            on a miss there, from the Redis cache.
+            Redis errors are logged and treated as a cache miss.
+        
+        :param self: Represent the instance of a class
+        :param email: str: The e-mail of the user
+        :return: A detached user object or None
+        :doc-author: Trelent
+        """
+        user = local_users.get(email)
+        if user is not None:
+            return user
+        try:
+            data = await self.r.get(user_cache_key(email))
+        except redis.RedisError as e:
+            logger.warning("User cache is unavailable: %s", e)
+            return None
+        user = load_user(data) if data is not None else None
+        if user is not None:
+            local_users.set(email, user)
         return user
 
+    async def cache_user(self, user: User) -> None:
+        """
+        The cache_user function stores a user in the Redis cache with a single SETEX.
+            Redis errors are logged and ignored.
+        
+        :param self: Represent the instance of a class
+        :param user: User: The user to cache
+        :return: None
+        :doc-author: Trelent
+        """
+        try:
+            await self.r.setex(user_cache_key(user.email), settings.user_cache_ttl, dump_user(user))
+        except redis.RedisError as e:
+            logger.warning("User cache is unavailable: %s", e)
+        # keep a detached copy, the loaded user stays bound to the request's session
+        local_users.set(user.email, load_user(dump_user(user)))
+
+    async def invalidate_users(self, emails: Iterable[str]) -> None:
+        """
+        The invalidate_users function drops users from the Redis cache and tells every
+            worker to drop them from its in-process cache.
+        
+        :param self: Represent the instance of a class
+        :param emails: Iterable[str]: The e-mails of the changed users
+        :return: None
+        :doc-author: Trelent
+        """
+        emails = list(emails)
+        for email in emails:
+            local_users.pop(email)
+        try:
+            await self.r.delete(*[user_cache_key(email) for email in emails])
+            await self.r.publish(USER_INVALIDATION_CHANNEL, orjson.dumps(emails))
+        except redis.RedisError as e:
+            logger.warning("Could not invalidate cached users %s: %s", emails, e)
+
+    async def listen_for_invalidations(self) -> None:
+        """
+        The listen_for_invalidations function runs for the lifetime of a worker and drops
+            users from the in-process cache when any worker publishes a change.
+            The in-process cache is cleared whenever the subscription is (re)established,
+            because messages may have been missed while it was down.
+        
+        :param self: Represent the instance of a class
+        :return: None
+        :doc-author: Trelent
+        """
+        while True:
+            try:
+                async with self.r.pubsub() as pubsub:
+                    await pubsub.subscribe(USER_INVALIDATION_CHANNEL)
+                    local_users.clear()
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            for email in orjson.loads(message["data"]):
+                                local_users.pop(email)
+            except (redis.RedisError, ValueError) as e:
+                logger.warning("User cache invalidation listener failed: %s", e)
+                local_users.clear()
+                await asyncio.sleep(1)
+
     async def decode_refresh_token(self, refresh_token: str):
         """
         The decode_refresh_token function is used to decode the refresh token.
@@ -218,3 +390,25 @@ class Auth:
 
 
 auth_servise = Auth()
+_invalidations = set()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session: Session) -> None:
+    emails = session.info.pop("changed_users", None)
+    if not emails:
+        return
+    for email in emails:
+        local_users.pop(email)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(auth_servise.invalidate_users(emails))
+    _invalidations.add(task)
+    task.add_done_callback(_invalidations.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_users(session: Session) -> None:
+    session.info.pop("changed_users", None)
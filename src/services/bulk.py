@@ -0,0 +1,113 @@
+import codecs
+import csv
+import io
+import json
+from typing import AsyncIterator, Dict, List, Sequence, Tuple
+
+
+CSV_TYPES = ("text/csv",)
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+async def iter_lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    The iter_lines function splits a stream of utf-8 encoded chunks into text lines.
+    Only one chunk and one partial line are held in memory at a time.
+
+    :param stream: AsyncIterator[bytes]: The request body stream
+    :return: An async iterator over the lines, line endings included
+    :doc-author: Trelent
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in stream:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_csv_records(stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Dict | str]]:
+    """
+    The iter_csv_records function parses a streamed CSV document with a header row.
+    Quoted fields may span several lines.
+
+    :param stream: AsyncIterator[bytes]: The request body stream
+    :return: An async iterator of (row number, record) pairs; the record is an error message for malformed rows
+    :doc-author: Trelent
+    """
+    header, record, row = None, "", 0
+    async for line in iter_lines(stream):
+        record += line
+        if record.count('"') % 2:
+            continue  # a quoted field continues on the next line
+        values, record = next(csv.reader([record]), []), ""
+        if not values:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield row, f"Expected {len(header)} fields, got {len(values)}"
+        else:
+            yield row, dict(zip(header, values))
+    if record.strip():
+        yield row + 1, "Unterminated quoted field"
+
+
+async def iter_ndjson_records(stream: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Dict | str]]:
+    """
+    The iter_ndjson_records function parses a streamed newline-delimited JSON document,
+    one object per line.
+
+    :param stream: AsyncIterator[bytes]: The request body stream
+    :return: An async iterator of (row number, record) pairs; the record is an error message for malformed rows
+    :doc-author: Trelent
+    """
+    row = 0
+    async for line in iter_lines(stream):
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield row, f"Invalid JSON: {e}"
+            continue
+        if isinstance(record, dict):
+            yield row, record
+        else:
+            yield row, "Expected a JSON object"
+
+
+def format_ndjson(rows: List[Dict]) -> str:
+    """
+    The format_ndjson function serializes a batch of rows as newline-delimited JSON.
+
+    :param rows: List[Dict]: The rows to serialize
+    :return: One JSON object per line
+    :doc-author: Trelent
+    """
+    return "".join(json.dumps(dict(row), default=str) + "\n" for row in rows)
+
+
+def format_csv(rows: List[Dict], fields: Sequence[str], header: bool = False) -> str:
+    """
+    The format_csv function serializes a batch of rows as CSV.
+
+    :param rows: List[Dict]: The rows to serialize
+    :param fields: Sequence[str]: The columns to write, in order
+    :param header: bool: Write the header row first
+    :return: The CSV text
+    :doc-author: Trelent
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    if header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
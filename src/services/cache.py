@@ -0,0 +1,89 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        The get function returns a fresh entry and marks it as recently used.
+        Expired entries are dropped; every lookup counts as a hit or a miss.
+
+        :param self: Represent the instance of the class
+        :param key: Hashable: The cache key
+        :return: The cached value or None
+        :doc-author: Trelent
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+        if entry is not None:
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        The set function stores an entry, evicting the least recently used one when the cache is full.
+
+        :param self: Represent the instance of the class
+        :param key: Hashable: The cache key
+        :param value: Any: The value to cache
+        :param ttl: float | None: Lifetime of this entry in seconds, capped at the cache's ttl
+        :return: None
+        :doc-author: Trelent
+        """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        """
+        The pop function removes an entry if it is cached.
+
+        :param self: Represent the instance of the class
+        :param key: Hashable: The cache key
+        :return: None
+        :doc-author: Trelent
+        """
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """
+        The clear function removes every entry; the counters are kept.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        The stats function reports the size and the hit/miss counters of the cache.
+
+        :param self: Represent the instance of the class
+        :return: A dictionary with size, maxsize, hits, misses and hit_ratio
+        :doc-author: Trelent
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
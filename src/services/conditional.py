@@ -0,0 +1,85 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Iterable, Tuple
+
+from fastapi import Request
+
+
+def contact_etag(contact_id: int, version: int) -> str:
+    """
+    The contact_etag function builds the strong ETag of a single contact from its id and version.
+
+    :param contact_id: int: The id of the contact
+    :param version: int: The version of the contact
+    :return: A quoted entity tag
+    :doc-author: Trelent
+    """
+    return f'"{contact_id}-{version}"'
+
+
+def list_etag(versions: Iterable[Tuple[int, int]]) -> str:
+    """
+    The list_etag function builds the strong ETag of a page of contacts from the ids and
+    versions of its rows, so any change, insert or removal inside the page changes the tag.
+
+    :param versions: Iterable[Tuple[int, int]]: The (id, version) pairs of the page, in order
+    :return: A quoted entity tag
+    :doc-author: Trelent
+    """
+    digest = hashlib.sha1(",".join(f"{id}:{version}" for id, version in versions).encode())
+    return f'"{digest.hexdigest()}"'
+
+
+def http_date(value: datetime) -> str:
+    """
+    The http_date function formats a timestamp for the Last-Modified header.
+    Naive timestamps are taken as UTC.
+
+    :param value: datetime: The timestamp
+    :return: An IMF-fixdate string
+    :doc-author: Trelent
+    """
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def is_conditional(request: Request) -> bool:
+    """
+    The is_conditional function tells whether the request carries a validator worth checking.
+
+    :param request: Request: The incoming request
+    :return: True if If-None-Match or If-Modified-Since is present
+    :doc-author: Trelent
+    """
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """
+    The not_modified function evaluates If-None-Match and If-Modified-Since the way RFC 9110 does:
+    If-Modified-Since is ignored when If-None-Match is present.
+
+    :param request: Request: The incoming request
+    :param etag: str: The current ETag of the resource
+    :param last_modified: datetime | None: The current modification time, if the resource has one
+    :return: True if the client's copy is still current and 304 may be sent
+    :doc-author: Trelent
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
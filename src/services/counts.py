@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, Tuple
+
+import orjson
+import redis.asyncio as redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.conf.config import settings
+
+logger = logging.getLogger(__name__)
+
+COUNT_INVALIDATION_CHANNEL = "count:invalidate"
+
+
+class CountCache:
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._counts: Dict[str, Tuple[int, float]] = {}
+
+    def get(self, table: str) -> int | None:
+        """
+        The get function returns the cached row count of a table while it is fresh.
+
+        :param self: Represent the instance of the class
+        :param table: str: The table name
+        :return: The cached count or None
+        :doc-author: Trelent
+        """
+        cached = self._counts.get(table)
+        if cached is None or time.monotonic() - cached[1] >= self.ttl:
+            return None
+        return cached[0]
+
+    def set(self, table: str, count: int) -> None:
+        """
+        The set function caches the row count of a table.
+
+        :param self: Represent the instance of the class
+        :param table: str: The table name
+        :param count: int: The row count
+        :return: None
+        :doc-author: Trelent
+        """
+        self._counts[table] = (count, time.monotonic())
+
+    def invalidate(self, table: str) -> None:
+        """
+        The invalidate function drops the cached row count of a table.
+
+        :param self: Represent the instance of the class
+        :param table: str: The table name
+        :return: None
+        :doc-author: Trelent
+        """
+        self._counts.pop(table, None)
+
+    def clear(self) -> None:
+        """
+        The clear function drops every cached row count.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        self._counts.clear()
+
+
+row_counts = CountCache(settings.total_count_ttl)
+r = redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0)
+_invalidations = set()
+
+
+def mark_changed(db: AsyncSession, table: str) -> None:
+    """
+    The mark_changed function records that the session inserted or deleted rows of table.
+    The cached count is dropped once the transaction commits, so a concurrent request can
+    not cache the old count again in between. Other workers drop it when they receive the
+    message published on COUNT_INVALIDATION_CHANNEL; if Redis is unavailable their count is
+    stale for at most settings.total_count_ttl seconds.
+
+    :param db: AsyncSession: The session doing the write
+    :param table: str: The table name
+    :return: None
+    :doc-author: Trelent
+    """
+    db.info.setdefault("changed_tables", set()).add(table)
+
+
+async def publish_invalidations(tables: Iterable[str]) -> None:
+    """
+    The publish_invalidations function tells every worker to drop the cached counts of tables.
+
+    :param tables: Iterable[str]: The changed tables
+    :return: None
+    :doc-author: Trelent
+    """
+    tables = sorted(tables)
+    try:
+        await r.publish(COUNT_INVALIDATION_CHANNEL, orjson.dumps(tables))
+    except redis.RedisError as e:
+        logger.warning("Could not invalidate cached counts of %s: %s", tables, e)
+
+
+async def listen_for_invalidations() -> None:
+    """
+    The listen_for_invalidations function runs for the lifetime of a worker and drops cached
+        counts when any worker publishes a change. All counts are dropped whenever the
+        subscription is (re)established, because messages may have been missed while it was down.
+
+    :return: None
+    :doc-author: Trelent
+    """
+    while True:
+        try:
+            async with r.pubsub() as pubsub:
+                await pubsub.subscribe(COUNT_INVALIDATION_CHANNEL)
+                row_counts.clear()
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        for table in orjson.loads(message["data"]):
+                            row_counts.invalidate(table)
+        except (redis.RedisError, ValueError) as e:
+            logger.warning("Count invalidation listener failed: %s", e)
+            row_counts.clear()
+            await asyncio.sleep(1)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed(session: Session) -> None:
+    tables = session.info.pop("changed_tables", None)
+    if not tables:
+        return
+    for table in tables:
+        row_counts.invalidate(table)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(publish_invalidations(tables))
+    _invalidations.add(task)
+    task.add_done_callback(_invalidations.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed(session: Session) -> None:
+    session.info.pop("changed_tables", None)
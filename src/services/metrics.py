@@ -0,0 +1,49 @@
+import bisect
+import threading
+from typing import List, Sequence
+
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets: List[float] = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        """
+        The observe function records a single measurement in the histogram.
+
+        :param self: Represent the instance of the class
+        :param value: float: The measured value, in seconds
+        :return: None
+        :doc-author: Trelent
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        """
+        The snapshot function returns the current state of the histogram as a dictionary.
+        Bucket counts are cumulative, so every bucket holds the number of observations
+        less than or equal to its upper bound.
+
+        :param self: Represent the instance of the class
+        :return: A dictionary with count, sum and cumulative buckets
+        :doc-author: Trelent
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        buckets, cumulative = {}, 0
+        for bound, value in zip(self.buckets + [float("inf")], counts):
+            cumulative += value
+            buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+        return {"count": count, "sum": total, "buckets": buckets}
@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Tuple
+
+
+def _encode(values: List[Any]) -> str:
+    raw = json.dumps(values).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str, size: int) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    The encode_cursor function turns the sort key of the last row of a page into an opaque cursor.
+
+    :param created_at: datetime: The creation time of the last row
+    :param id: int: The id of the last row
+    :return: A url-safe cursor string
+    :doc-author: Trelent
+    """
+    return _encode([created_at.isoformat(), id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    The decode_cursor function restores the sort key encoded by encode_cursor.
+
+    :param cursor: str: The cursor received from the client
+    :return: A tuple of created_at and id
+    :raises ValueError: If the cursor is malformed
+    :doc-author: Trelent
+    """
+    created_at, id = _decode(cursor, 2)
+    try:
+        return datetime.fromisoformat(created_at), int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def encode_rank_cursor(rank: float, id: int) -> str:
+    """
+    The encode_rank_cursor function turns the relevance and id of the last search hit into an opaque cursor.
+
+    :param rank: float: The relevance of the last row
+    :param id: int: The id of the last row
+    :return: A url-safe cursor string
+    :doc-author: Trelent
+    """
+    return _encode([rank, id])
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    The decode_rank_cursor function restores the sort key encoded by encode_rank_cursor.
+
+    :param cursor: str: The cursor received from the client
+    :return: A tuple of rank and id
+    :raises ValueError: If the cursor is malformed
+    :doc-author: Trelent
+    """
+    rank, id = _decode(cursor, 2)
+    try:
+        return float(rank), int(id)
+    except (TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from src.conf.config import settings
+from src.services.metrics import Histogram
+
+
+class PasswordPool:
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.queue_wait = Histogram()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+
+    def _timed(self, submitted: float, func: Callable, args: tuple) -> Any:
+        self.queue_wait.observe(time.perf_counter() - submitted)
+        return func(*args)
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        The run function calls func in the worker pool and waits for the result without blocking
+        the event loop. At most workers calls run at the same time; the others wait in the queue
+        and the time they spent there is recorded in queue_wait.
+
+        :param self: Represent the instance of the class
+        :param func: Callable: The CPU bound function, e.g. CryptContext.verify
+        :param args: The arguments of func
+        :return: The result of func
+        :doc-author: Trelent
+        """
+        with self._lock:
+            self._pending += 1
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor, self._timed, time.perf_counter(), func, args
+            )
+        finally:
+            # also runs when the request is cancelled while the call is still queued
+            with self._lock:
+                self._pending -= 1
+
+    def shutdown(self) -> None:
+        """
+        The shutdown function stops the worker threads once the queued calls are done.
+
+        :param self: Represent the instance of the class
+        :return: None
+        :doc-author: Trelent
+        """
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        """
+        The stats function reports the size of the pool, the number of queued or running calls
+        and the histogram of the time calls waited for a free worker.
+
+        :param self: Represent the instance of the class
+        :return: A dictionary with workers, pending and queue_wait_seconds
+        :doc-author: Trelent
+        """
+        return {
+            "workers": self.workers,
+            "pending": self._pending,
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+        }
+
+
+password_pool = PasswordPool(settings.password_hash_workers)
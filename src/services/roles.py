@@ -1,24 +1,89 @@
-from typing import Any, List
+from typing import List
 
-from fastapi import Depends, HTTPException, status, Request
+from fastapi import Depends, HTTPException, status
+from jose import JWTError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models import User, Role
+from src.conf.config import settings
+from src.database.db import get_db
+from src.database.models import Role, User
 from src.services.auth import auth_servise
+from src.services.user_cache import local_users
 
 
 class RoleAccess:
+    def __new__(cls, allowed_roles: List[Role]):
+        if cls is RoleAccess and settings.stateless_roles:
+            cls = StatelessRoleAccess
+        return super().__new__(cls)
+
     def __init__(self, allowed_roles: List[Role]):
         self.allowed_roles = allowed_roles
 
+    def check(self, role: Role) -> None:
+        """
+        The check function raises 403 unless role is one of the allowed roles.
+
+        :param self: Represent the instance of the class
+        :param role: Role: The role of the current user
+        :return: None
+        :doc-author: Trelent
+        """
+        if role not in self.allowed_roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Operation forbidden"
+            )
+
+    async def __call__(self, current_user: User = Depends(auth_servise.get_current_user)):
+        """
+        The __call__ function lets only users with one of the allowed roles through.
+            With settings.stateless_roles on, RoleAccess creates a StatelessRoleAccess instead.
+
+        :param self: Represent the instance of the class
+        :param current_user: User: The user of the access token
+        :return: None
+        :doc-author: Trelent
+        """
+        self.check(current_user.roles)
+
+
+class StatelessRoleAccess(RoleAccess):
     async def __call__(
         self,
-        request: Request,
-        current_user: User = Depends(auth_servise.get_current_user),
+        token: str = Depends(auth_servise.oauth2_scheme),
+        db: AsyncSession = Depends(get_db),
     ):
-        print(request.method, request.url)
-        print(f"User role{current_user.roles}")
-        print(f"Allowed roles: {self.allowed_roles}")
-        if current_user.roles not in self.allowed_roles:
+        """
+        The __call__ function authorizes from the role claim of the access token without
+            loading the user. When the user is in the in-process cache, its role and
+            token_version are used instead, so a revoked token is rejected there; otherwise a
+            revoked token keeps passing role checks until it expires, which is why
+            create_access_token caps such tokens at settings.stateless_token_ttl.
+            Tokens without a role claim, e.g. issued before the mode was switched on,
+            are authorized from the user as before.
+
+        :param self: Represent the instance of the class
+        :param token: str: Get the token from the authorization header
+        :param db: AsyncSession: Load the user when the token carries no role
+        :return: None
+        :doc-author: Trelent
+        """
+        try:
+            claims = auth_servise.decode_access_token(token)
+        except JWTError:
+            claims = {}  # get_current_user answers with 401
+        if "role" not in claims:
+            current_user = await auth_servise.get_current_user(token, db)
+            self.check(current_user.roles)
+            return
+        cached_user = local_users.get(claims.get("sub"))
+        if cached_user is None:
+            self.check(Role(claims["role"]))
+            return
+        if claims.get("ver") != cached_user.token_version:
             raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Operation forbidden"
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+                headers={"WWW-Authenticate": "Bearer"},
             )
+        self.check(cached_user.roles)
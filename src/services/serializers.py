@@ -0,0 +1,102 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter, create_model
+
+
+@lru_cache(maxsize=None)
+def list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """
+    The list_adapter function builds the validator and serializer for a list of model once
+    and caches it for the lifetime of the process.
+
+    :param model: Type[BaseModel]: The item model
+    :return: A TypeAdapter for List[model]
+    :doc-author: Trelent
+    """
+    return TypeAdapter(List[model])
+
+
+def parse_fields(fields: str, model: Type[BaseModel], always: Tuple[str, ...] = ("id",)) -> Tuple[str, ...]:
+    """
+    The parse_fields function turns a comma-separated fields parameter into a tuple of field
+    names of model, in the model's field order.
+
+    :param fields: str: The raw parameter, e.g. "name,e_mail"
+    :param model: Type[BaseModel]: The full response model
+    :param always: Tuple[str, ...]: Fields that are included even when not requested
+    :return: The selected field names
+    :raises ValueError: If a field is not part of model
+    :doc-author: Trelent
+    """
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested - model.model_fields.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(field for field in model.model_fields if field in requested or field in always)
+
+
+@lru_cache(maxsize=None)
+def partial_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    The partial_model function derives a response model that only has the given fields of model.
+    Models are cached per field selection.
+
+    :param model: Type[BaseModel]: The full response model
+    :param fields: Tuple[str, ...]: The fields to keep, as returned by parse_fields
+    :return: The trimmed model
+    :doc-author: Trelent
+    """
+    definitions = {field: (model.model_fields[field].annotation, ...) for field in fields}
+    return create_model(f"Partial{model.__name__}", **definitions)
+
+
+def serialize_list(model: Type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """
+    The serialize_list function validates ORM objects or row mappings against model
+    in a single pass and dumps them straight to JSON bytes.
+
+    :param model: Type[BaseModel]: The item model
+    :param rows: Iterable[Any]: ORM objects, row mappings or dicts
+    :return: The JSON document
+    :doc-author: Trelent
+    """
+    adapter = list_adapter(model)
+    return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+
+def _headers(response: Response | None) -> dict | None:
+    if response is None:
+        return None
+    return {key: value for key, value in response.headers.items() if key != "content-length"}
+
+
+def list_response(model: Type[BaseModel], rows: Iterable[Any], response: Response | None = None) -> Response:
+    """
+    The list_response function returns rows as a ready JSON response, so FastAPI does not
+    validate and encode them a second time against the route's response_model.
+
+    :param model: Type[BaseModel]: The item model
+    :param rows: Iterable[Any]: ORM objects, row mappings or dicts
+    :param response: Response | None: The injected response whose headers should be kept
+    :return: The JSON response
+    :doc-author: Trelent
+    """
+    return Response(
+        serialize_list(model, rows), media_type="application/json", headers=_headers(response)
+    )
+
+
+def item_response(model: Type[BaseModel], row: Any, response: Response | None = None) -> Response:
+    """
+    The item_response function is the single-object counterpart of list_response.
+
+    :param model: Type[BaseModel]: The response model
+    :param row: Any: An ORM object, row mapping or dict
+    :param response: Response | None: The injected response whose headers should be kept
+    :return: The JSON response
+    :doc-author: Trelent
+    """
+    content = model.model_validate(row, from_attributes=True).model_dump_json().encode()
+    return Response(content, media_type="application/json", headers=_headers(response))
@@ -0,0 +1,85 @@
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.models import Role, User
+from src.services.cache import TTLCache
+
+
+USER_CACHE_VERSION = 2
+USER_INVALIDATION_CHANNEL = "user:invalidate"
+
+local_users = TTLCache(settings.user_local_cache_size, settings.user_local_cache_ttl)
+
+
+def user_cache_key(email: str) -> str:
+    """
+    The user_cache_key function returns the Redis key of a cached user.
+    The key carries the encoding version, so entries written by another version are never read.
+
+    :param email: str: The e-mail of the user
+    :return: The Redis key
+    :doc-author: Trelent
+    """
+    return f"user:v{USER_CACHE_VERSION}:{email}"
+
+
+def dump_user(user: User) -> bytes:
+    """
+    The dump_user function encodes the fields of a user that UserResponse and RoleAccess need.
+    The password hash and the refresh token are never cached.
+
+    :param user: User: The user to encode
+    :return: The JSON encoded user
+    :doc-author: Trelent
+    """
+    return orjson.dumps(
+        {
+            "v": USER_CACHE_VERSION,
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "avatar": user.avatar,
+            "roles": user.roles.value if user.roles else None,
+            "confirmed": user.confirmed,
+            "token_version": user.token_version,
+        }
+    )
+
+
+def load_user(data: bytes) -> User | None:
+    """
+    The load_user function decodes a user encoded by dump_user into a detached User.
+
+    :param data: bytes: The cached value
+    :return: The user, or None if the value is malformed or has another version
+    :doc-author: Trelent
+    """
+    try:
+        payload = orjson.loads(data)
+        if payload.get("v") != USER_CACHE_VERSION:
+            return None
+        return User(
+            id=payload["id"],
+            username=payload["username"],
+            email=payload["email"],
+            avatar=payload["avatar"],
+            roles=Role(payload["roles"]) if payload["roles"] else None,
+            confirmed=payload["confirmed"],
+            token_version=payload["token_version"],
+        )
+    except (orjson.JSONDecodeError, AttributeError, KeyError, ValueError):
+        return None
+
+
+def mark_user_changed(db: AsyncSession, email: str) -> None:
+    """
+    The mark_user_changed function records that the session changed a cached user.
+    The cached copies are invalidated in every worker once the transaction commits.
+
+    :param db: AsyncSession: The session doing the write
+    :param email: str: The e-mail of the user
+    :return: None
+    :doc-author: Trelent
+    """
+    db.info.setdefault("changed_users", set()).add(email)
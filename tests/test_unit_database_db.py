@@ -0,0 +1,145 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import unittest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.db import (
+    ReplicaMonitor,
+    TransactionalRoute,
+    QueryStats,
+    query_stats,
+    before_cursor_execute,
+    after_cursor_execute,
+)
+
+
+def replica_engine_mock(lag=None, error=None):
+    connection = AsyncMock()
+    if error:
+        connection.execute.side_effect = error
+    else:
+        connection.execute.return_value = MagicMock(scalar=MagicMock(return_value=lag))
+    engine = MagicMock()
+    engine.connect.return_value.__aenter__.return_value = connection
+    return engine
+
+
+class TestReplicaMonitor(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.monitor = ReplicaMonitor(max_lag=5, check_interval=60)
+
+    async def test_no_replica_configured(self):
+        with patch("src.database.db.replica_engine", None):
+            self.assertFalse(await self.monitor.is_healthy())
+
+    async def test_replica_in_sync(self):
+        with patch("src.database.db.replica_engine", replica_engine_mock(lag=0.5)):
+            self.assertTrue(await self.monitor.is_healthy())
+        self.assertEqual(self.monitor.lag, 0.5)
+
+    async def test_replica_lagging(self):
+        with patch("src.database.db.replica_engine", replica_engine_mock(lag=30)):
+            self.assertFalse(await self.monitor.is_healthy())
+
+    async def test_replica_unreachable(self):
+        error = ConnectionRefusedError("connection refused")
+        with patch("src.database.db.replica_engine", replica_engine_mock(error=error)):
+            self.assertFalse(await self.monitor.is_healthy())
+        self.assertIsNone(self.monitor.lag)
+
+    async def test_replica_hanging(self):
+        async def hang(*args, **kwargs):
+            await asyncio.sleep(60)
+
+        engine = replica_engine_mock(lag=0)
+        engine.connect.return_value.__aenter__.side_effect = hang
+        with patch("src.database.db.replica_engine", engine), patch.object(
+            settings, "replica_connect_timeout", 0.05
+        ):
+            self.assertFalse(await asyncio.wait_for(self.monitor.is_healthy(), 1))
+        self.assertIsNone(self.monitor.lag)
+
+    async def test_health_is_cached(self):
+        engine = replica_engine_mock(lag=0)
+        with patch("src.database.db.replica_engine", engine):
+            await self.monitor.is_healthy()
+            await self.monitor.is_healthy()
+        self.assertEqual(engine.connect.call_count, 1)
+
+
+class TestQueryStats(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = MagicMock(info={})
+        self.stats = QueryStats("GET /api/contacts/")
+        self.token = query_stats.set(self.stats)
+
+    def tearDown(self):
+        query_stats.reset(self.token)
+
+    def execute(self, statement="SELECT 1"):
+        before_cursor_execute(self.conn, None, statement, None, None, False)
+        after_cursor_execute(self.conn, None, statement, None, None, False)
+
+    def test_queries_are_counted(self):
+        self.execute()
+        self.execute()
+        self.assertEqual(self.stats.count, 2)
+        self.assertGreaterEqual(self.stats.duration, 0)
+
+    def test_slow_query_is_logged(self):
+        with patch("src.database.db.settings.slow_query_threshold", 0):
+            with self.assertLogs("src.database.db", level="WARNING") as logs:
+                self.execute("SELECT pg_sleep(1)")
+        self.assertIn("GET /api/contacts/", logs.output[0])
+        self.assertIn("SELECT pg_sleep(1)", logs.output[0])
+
+
+class TestTransactionalRoute(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.session = AsyncMock(spec=AsyncSession)
+        self.session.in_transaction = MagicMock(return_value=True)
+
+        async def get_test_db(request: Request):
+            request.state.db = self.session
+            yield self.session
+
+        router = APIRouter(route_class=TransactionalRoute)
+
+        @router.post("/ok")
+        async def ok(db: AsyncSession = Depends(get_test_db)):
+            return {}
+
+        @router.post("/fail")
+        async def fail(db: AsyncSession = Depends(get_test_db)):
+            raise HTTPException(status_code=409)
+
+        self.app = FastAPI()
+        self.app.include_router(router)
+
+    async def test_commit_once_on_success(self):
+        async with AsyncClient(app=self.app, base_url="http://test") as ac:
+            response = await ac.post("/ok")
+        self.assertEqual(response.status_code, 200)
+        self.session.commit.assert_awaited_once()
+
+    async def test_no_commit_on_error(self):
+        async with AsyncClient(app=self.app, base_url="http://test") as ac:
+            response = await ac.post("/fail")
+        self.assertEqual(response.status_code, 409)
+        self.session.commit.assert_not_awaited()
+
+
+if __name__ == '__main__':
+    unittest.main()
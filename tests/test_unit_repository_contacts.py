@@ -4,44 +4,137 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 import unittest
-from unittest.mock import MagicMock
+from datetime import date
+from unittest.mock import MagicMock, AsyncMock, patch
 
-from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Contact
-from src.schemas import ContactModel, ContactUpdate, ContactStatusUpdate
+from src.services.counts import CountCache
+from src.schemas import (
+    ContactModel,
+    ContactUpdate,
+    ContactPatch,
+    ContactBatchUpdate,
+)
 from src.repository.contacts import (
     get_contacts,
     get_contact,
+    get_contacts_by_ids,
+    count_contacts,
+    search_contacts,
+    escape_like,
+    full_text_search,
+    birthday_keys,
     create_contact,
+    create_contacts,
+    upsert_contacts,
     remove_contact,
     update_contact,
-    update_status_contact,
+    patch_contact,
+    update_contacts,
+    remove_contacts,
 )
 
 
 class TestContacts(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
-        self.session = MagicMock(spec=Session)
+        self.session = AsyncMock(spec=AsyncSession)
 
     async def test_get_contacts(self):
-        contacts = [Contact(), Contact(), Contact()]
-        self.session.query().offset().limit().all.return_value = contacts
+        contacts = [{"id": 1}, {"id": 2}, {"id": 3}]
+        mocked_contacts = MagicMock()
+        mocked_contacts.mappings.return_value.all.return_value = contacts
+        self.session.execute.return_value = mocked_contacts
         result = await get_contacts(skip=0, limit=10, db=self.session)
         self.assertEqual(result, contacts)
+        stmt = self.session.execute.call_args.args[0]
+        self.assertNotIn("search_vector", str(stmt))
+
+    async def test_count_contacts_is_cached(self):
+        self.session.scalar.return_value = 7
+        with patch("src.repository.contacts.row_counts", CountCache(ttl=60)):
+            self.assertEqual(await count_contacts(db=self.session), 7)
+            self.assertEqual(await count_contacts(db=self.session), 7)
+        self.session.scalar.assert_awaited_once()
 
     async def test_get_contact_found(self):
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
+        mocked_contact = MagicMock()
+        mocked_contact.scalar_one_or_none.return_value = contact
+        self.session.execute.return_value = mocked_contact
         result = await get_contact(contact_id=1, db=self.session)
         self.assertEqual(result, contact)
 
     async def test_get_contact_not_found(self):
-        self.session.query().filter().first.return_value = None
+        mocked_contact = MagicMock()
+        mocked_contact.scalar_one_or_none.return_value = None
+        self.session.execute.return_value = mocked_contact
         result = await get_contact(contact_id=1, db=self.session)
         self.assertIsNone(result)
 
+    async def test_get_contacts_by_ids_keeps_order(self):
+        first, second = Contact(id=1), Contact(id=2)
+        mocked_contacts = MagicMock()
+        mocked_contacts.scalars.return_value.all.return_value = [first, second]
+        self.session.execute.return_value = mocked_contacts
+        result = await get_contacts_by_ids(ids=[2, 5, 1, 2], db=self.session)
+        self.assertEqual(result, [second, first])
+        stmt = self.session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("contacts.id = ANY (%(ids)s::INTEGER[])", sql)
+
+    async def test_search_contacts(self):
+        contacts = [{"id": 1}, {"id": 2}]
+        mocked_contacts = MagicMock()
+        mocked_contacts.mappings.return_value.all.return_value = contacts
+        self.session.execute.return_value = mocked_contacts
+        result = await search_contacts(
+            name="test", last_name="test", e_mail=None, db=self.session, limit=10
+        )
+        self.assertEqual(result, contacts)
+        stmt = str(self.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        self.assertIn("ILIKE", stmt)
+        self.assertIn("similarity", stmt)
+
+    async def test_search_contacts_sparse_fields(self):
+        self.session.execute.return_value = MagicMock()
+        await search_contacts(
+            name="test", last_name=None, e_mail=None, db=self.session, fields=("name",)
+        )
+        stmt = self.session.execute.call_args.args[0]
+        self.assertEqual([column.key for column in stmt.selected_columns], ["id", "name"])
+
+    async def test_full_text_search(self):
+        rows = [{"id": 1, "rank": 0.5, "headline": "<mark>test</mark>"}]
+        mocked_rows = MagicMock()
+        mocked_rows.mappings.return_value.all.return_value = rows
+        self.session.execute.return_value = mocked_rows
+        result = await full_text_search("test", 10, self.session, after=(0.7, 3))
+        self.assertEqual(result, rows)
+        stmt = str(self.session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        self.assertIn("search_vector @@ websearch_to_tsquery", stmt)
+        self.assertIn("ts_headline", stmt)
+        self.assertIn("replace(replace(contacts.description", stmt)
+
+    def test_birthday_keys_wrap_year(self):
+        self.assertEqual(
+            birthday_keys(date(2023, 12, 28), 6),
+            [1228, 1229, 1230, 1231, 101, 102, 103],
+        )
+
+    def test_birthday_keys_feb_29(self):
+        self.assertEqual(birthday_keys(date(2023, 2, 27), 2), [227, 228, 229, 301])
+        self.assertEqual(birthday_keys(date(2024, 2, 27), 2), [227, 228, 229])
+
+    def test_escape_like(self):
+        self.assertEqual(escape_like("50%_off\\"), "50\\%\\_off\\\\")
+
     async def test_create_contact(self):
         body = ContactModel(
             name="test",
@@ -60,14 +153,89 @@ class TestContacts(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result.description, body.description)
         self.assertTrue(hasattr(result, "id"))
 
+    async def test_create_contact_duplicate_e_mail(self):
+        body = ContactModel(
+            name="test",
+            last_name="test",
+            e_mail="test@example.com",
+            phone_number="123456789",
+            born_date="2000-01-01",
+            description="test contact",
+        )
+        self.session.flush.side_effect = IntegrityError("INSERT", {}, Exception())
+        with self.assertRaises(HTTPException) as context:
+            await create_contact(body=body, db=self.session)
+        self.assertEqual(context.exception.status_code, 409)
+
+    async def test_create_contact_other_errors_propagate(self):
+        body = ContactModel(
+            name="test",
+            last_name="test",
+            e_mail="test@example.com",
+            phone_number="123456789",
+            born_date="2000-01-01",
+            description="test contact",
+        )
+        self.session.flush.side_effect = RuntimeError("connection lost")
+        with self.assertRaises(RuntimeError):
+            await create_contact(body=body, db=self.session)
+
+    async def test_create_contacts_skips_taken_e_mails(self):
+        bodies = [
+            ContactModel(
+                name="test",
+                last_name="test",
+                e_mail=f"test{i}@example.com",
+                phone_number="123456789",
+                born_date="2000-01-01",
+                description="test contact",
+            )
+            for i in range(3)
+        ]
+        mocked_contacts = MagicMock()
+        mocked_contacts.scalars.return_value.all.return_value = [1, 2]
+        self.session.execute.return_value = mocked_contacts
+        result = await create_contacts(bodies=bodies, db=self.session)
+        self.assertEqual(result, 2)
+        stmt = self.session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (lower(e_mail)) DO NOTHING", sql)
+
+    async def test_upsert_contacts_last_duplicate_wins(self):
+        bodies = [
+            ContactModel(
+                name="test",
+                last_name="test",
+                e_mail="test@example.com",
+                phone_number="123456789",
+                born_date="2000-01-01",
+                description=description,
+            )
+            for description in ("first", "second")
+        ]
+        contact = Contact()
+        mocked_contacts = MagicMock()
+        mocked_contacts.all.return_value = [contact]
+        self.session.scalars.return_value = mocked_contacts
+        result = await upsert_contacts(bodies=bodies, db=self.session)
+        self.assertEqual(result, [contact])
+        stmt = self.session.scalars.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("ON CONFLICT (lower(e_mail)) DO UPDATE SET", sql)
+        self.assertEqual(stmt.compile().params["description_m0"], "second")
+
     async def test_remove_contact_found(self):
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
+        mocked_contact = MagicMock()
+        mocked_contact.scalar_one_or_none.return_value = contact
+        self.session.execute.return_value = mocked_contact
         result = await remove_contact(contact_id=1, db=self.session)
         self.assertEqual(result, contact)
 
     async def test_remove_contact_not_found(self):
-        self.session.query().filter().first.return_value = None
+        mocked_contact = MagicMock()
+        mocked_contact.scalar_one_or_none.return_value = None
+        self.session.execute.return_value = mocked_contact
         result = await remove_contact(contact_id=1, db=self.session)
         self.assertIsNone(result)
 
@@ -82,8 +250,9 @@ class TestContacts(unittest.IsolatedAsyncioTestCase):
             done=True
         )
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
-        self.session.commit.return_value = None
+        mocked_contact = MagicMock()
+        mocked_contact.scalar_one_or_none.return_value = contact
+        self.session.execute.return_value = mocked_contact
         result = await update_contact(contact_id=1, body=body, db=self.session)
         self.assertEqual(result, contact)
 
@@ -97,26 +266,85 @@ class TestContacts(unittest.IsolatedAsyncioTestCase):
             description="test contact",
             done=True
         )
-        self.session.query().filter().first.return_value = None
-        self.session.commit.return_value = None
+        mocked_contact = MagicMock()
+        mocked_contact.scalar_one_or_none.return_value = None
+        self.session.execute.return_value = mocked_contact
         result = await update_contact(contact_id=1, body=body, db=self.session)
         self.assertIsNone(result)
 
-
-    async def test_update_status_contact_found(self):
-        body = ContactStatusUpdate(done=True)
+    async def test_patch_contact_sets_only_supplied_fields(self):
+        body = ContactPatch(description="new description")
         contact = Contact()
-        self.session.query().filter().first.return_value = contact
-        self.session.commit.return_value = None
-        result = await update_status_contact(contact_id=1, body=body, db=self.session)
+        mocked_contact = MagicMock()
+        mocked_contact.scalar_one_or_none.return_value = contact
+        self.session.execute.return_value = mocked_contact
+        result = await patch_contact(contact_id=1, body=body, db=self.session)
         self.assertEqual(result, contact)
+        stmt = self.session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("SET description=", sql)
+        self.assertNotIn("name=", sql)
+        self.assertIn("RETURNING", sql)
 
-    async def test_update_status_contact_not_found(self):
-        body = ContactStatusUpdate(done=True)
-        self.session.query().filter().first.return_value = None
-        self.session.commit.return_value = None
-        result = await update_status_contact(contact_id=1, body=body, db=self.session)
-        self.assertIsNone(result)
+    async def test_update_contacts(self):
+        body = ContactPatch(description="bulk")
+        mocked_contacts = MagicMock()
+        mocked_contacts.scalars.return_value.all.return_value = [2, 1]
+        self.session.execute.return_value = mocked_contacts
+        result = await update_contacts(ids=[1, 2, 3], body=body, db=self.session)
+        self.assertEqual(result, [2, 1])
+        self.session.execute.assert_awaited_once()
+        stmt = self.session.execute.call_args.args[0]
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+        self.assertIn("UPDATE contacts SET description=", sql)
+        self.assertIn("RETURNING contacts.id", sql)
+
+    async def test_patch_contact_duplicate_e_mail(self):
+        body = ContactPatch(e_mail="taken@example.com")
+        self.session.execute.side_effect = IntegrityError("UPDATE", {}, Exception())
+        with self.assertRaises(HTTPException) as context:
+            await patch_contact(contact_id=1, body=body, db=self.session)
+        self.assertEqual(context.exception.status_code, 409)
+
+    async def test_update_contacts_integrity_error(self):
+        body = ContactPatch(description="bulk")
+        self.session.execute.side_effect = IntegrityError("UPDATE", {}, Exception())
+        with self.assertRaises(HTTPException) as context:
+            await update_contacts(ids=[1, 2], body=body, db=self.session)
+        self.assertEqual(context.exception.status_code, 409)
+
+    def test_batch_update_rejects_e_mail(self):
+        with self.assertRaises(ValidationError):
+            ContactBatchUpdate(ids=[1, 2], changes={"e_mail": "same@example.com"})
+        batch = ContactBatchUpdate(ids=[1, 2], changes={"description": "bulk"})
+        self.assertEqual(batch.changes.description, "bulk")
+
+    def test_models_check_column_limits(self):
+        row = dict(
+            name="test",
+            last_name="test",
+            e_mail="test@example.com",
+            phone_number="+380 (67) 123-45-67",
+            born_date="2000-01-01",
+            description="test contact",
+        )
+        with self.assertRaises(ValidationError):
+            ContactModel(**row)
+        with self.assertRaises(ValidationError):
+            ContactModel(**dict(row, phone_number="+380671234567", e_mail="a" * 50 + "@example.com"))
+        self.assertEqual(ContactModel(**dict(row, phone_number="+380671234567")).phone_number, "+380671234567")
+        with self.assertRaises(ValidationError):
+            ContactPatch(phone_number="+380 (67) 123-45-67")
+        with self.assertRaises(ValidationError):
+            ContactPatch(e_mail="a" * 50 + "@example.com")
+
+    async def test_remove_contacts(self):
+        mocked_contacts = MagicMock()
+        mocked_contacts.scalars.return_value.all.return_value = [3]
+        self.session.execute.return_value = mocked_contacts
+        result = await remove_contacts(ids=[3, 4], db=self.session)
+        self.assertEqual(result, [3])
+        self.session.execute.assert_awaited_once()
 
 
 if __name__ == '__main__':
@@ -4,15 +4,18 @@ sys.path.append(str(Path(__file__).parent.parent))
 import sys
 from pathlib import Path
 import unittest
+from unittest.mock import AsyncMock, MagicMock
 from src.repository.users import (
     get_user_by_email,
     create_user,
     update_avatar,
     update_token,
     confirmed_email,
+    revoke_tokens,
 )
 from src.database.models import User
 from src.schemas import UserModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 class TestUsers(unittest.TestCase):
@@ -109,5 +112,21 @@ class TestUsers(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertTrue(result.confirmed)
 
+
+class TestRevokeTokens(unittest.IsolatedAsyncioTestCase):
+
+    async def test_revoke_tokens_bumps_version(self):
+        user = User(id=1, email="test@example.com", refresh_token="token", token_version=1)
+        db = AsyncMock(spec=AsyncSession)
+        db.info = {}
+        db.execute.return_value = MagicMock(scalar_one=MagicMock(return_value=2))
+        await revoke_tokens(user, db)
+        stmt = str(db.execute.await_args.args[0])
+        self.assertIn("token_version=(users.token_version +", stmt)
+        self.assertEqual(user.token_version, 2)
+        self.assertIsNone(user.refresh_token)
+        self.assertEqual(db.info["changed_users"], {"test@example.com"})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,203 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+import redis.asyncio as redis
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from src.conf.config import settings
+from src.database.models import Role, User
+from jose import JWTError, jwt
+
+from src.services.auth import auth_servise, token_cache_key, verified_tokens
+from src.services.user_cache import (
+    USER_CACHE_VERSION,
+    dump_user,
+    load_user,
+    local_users,
+    mark_user_changed,
+    user_cache_key,
+)
+
+
+class TestUserCache(unittest.TestCase):
+
+    def setUp(self):
+        self.user = User(
+            id=1,
+            username="test",
+            email="test@example.com",
+            password="hash",
+            refresh_token="refresh-secret",
+            avatar="https://example.com/avatar.png",
+            roles=Role.moderator,
+            confirmed=True,
+        )
+
+    def test_round_trip(self):
+        user = load_user(dump_user(self.user))
+        self.assertEqual(
+            (user.id, user.username, user.email, user.avatar, user.roles, user.confirmed),
+            (1, "test", "test@example.com", "https://example.com/avatar.png", Role.moderator, True),
+        )
+
+    def test_secrets_are_not_cached(self):
+        data = dump_user(self.user)
+        self.assertNotIn(b"hash", data)
+        self.assertNotIn(b"refresh-secret", data)
+
+    def test_other_versions_and_garbage_are_misses(self):
+        self.assertIsNone(load_user(b'{"v": %d}' % (USER_CACHE_VERSION + 1)))
+        self.assertIsNone(load_user(b"\x80\x04pickle"))
+
+    def test_key_is_versioned(self):
+        self.assertEqual(user_cache_key("a@b.c"), f"user:v{USER_CACHE_VERSION}:a@b.c")
+
+
+class TestGetCurrentUser(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.user = User(
+            id=1,
+            username="test",
+            email="test@example.com",
+            avatar="avatar",
+            roles=Role.user,
+            confirmed=True,
+        )
+        self.db = AsyncMock(spec=AsyncSession)
+        self.r = AsyncMock()
+        patcher = patch.object(auth_servise, "r", self.r)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        local_users.clear()
+        self.addCleanup(local_users.clear)
+        verified_tokens.clear()
+        self.addCleanup(verified_tokens.clear)
+
+    async def token(self):
+        return await auth_servise.create_access_token(data={"sub": self.user.email})
+
+    async def test_cache_hit_skips_database(self):
+        self.r.get.return_value = dump_user(self.user)
+        with patch("src.services.auth.repository_users.get_user_by_email") as get_user:
+            user = await auth_servise.get_current_user(await self.token(), self.db)
+        get_user.assert_not_called()
+        self.assertEqual(user.email, self.user.email)
+
+    async def test_cache_miss_writes_with_one_setex(self):
+        self.r.get.return_value = None
+        with patch(
+            "src.services.auth.repository_users.get_user_by_email", return_value=self.user
+        ):
+            user = await auth_servise.get_current_user(await self.token(), self.db)
+        self.assertIs(user, self.user)
+        self.r.setex.assert_awaited_once_with(
+            user_cache_key(self.user.email), settings.user_cache_ttl, dump_user(self.user)
+        )
+
+    async def test_local_cache_skips_redis(self):
+        self.r.get.return_value = dump_user(self.user)
+        token = await self.token()
+        await auth_servise.get_current_user(token, self.db)
+        await auth_servise.get_current_user(token, self.db)
+        self.r.get.assert_awaited_once()
+
+    async def test_invalidate_users_publishes(self):
+        local_users.set(self.user.email, self.user)
+        await auth_servise.invalidate_users([self.user.email])
+        self.assertIsNone(local_users.get(self.user.email))
+        self.r.delete.assert_awaited_once_with(user_cache_key(self.user.email))
+        self.r.publish.assert_awaited_once()
+
+    async def test_stale_token_version_is_rejected(self):
+        self.user.token_version = 2
+        self.r.get.return_value = dump_user(self.user)
+        token = await auth_servise.create_access_token(data={"sub": self.user.email}, user=self.user)
+        await auth_servise.get_current_user(token, self.db)
+        self.user.token_version = 3
+        self.r.get.return_value = dump_user(self.user)
+        local_users.clear()
+        with self.assertRaises(HTTPException) as raised:
+            await auth_servise.get_current_user(token, self.db)
+        self.assertEqual(raised.exception.status_code, 401)
+
+    async def test_redis_errors_fall_back_to_database(self):
+        self.r.get.side_effect = redis.ConnectionError("down")
+        self.r.setex.side_effect = redis.ConnectionError("down")
+        with patch(
+            "src.services.auth.repository_users.get_user_by_email", return_value=self.user
+        ):
+            user = await auth_servise.get_current_user(await self.token(), self.db)
+        self.assertIs(user, self.user)
+
+
+class TestDecodeAccessToken(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        verified_tokens.clear()
+        self.addCleanup(verified_tokens.clear)
+
+    async def test_repeated_decode_skips_verification(self):
+        token = await auth_servise.create_access_token(data={"sub": "test@example.com"})
+        with patch("src.services.auth.jwt.decode", wraps=jwt.decode) as decode:
+            first = auth_servise.decode_access_token(token)
+            second = auth_servise.decode_access_token(token)
+        decode.assert_called_once()
+        self.assertIs(first, second)
+        self.assertEqual(first["sub"], "test@example.com")
+
+    async def test_entry_expires_with_token(self):
+        token = await auth_servise.create_access_token(data={"sub": "test@example.com"}, expires_delta=30)
+        payload = auth_servise.decode_access_token(token)
+        deadline = verified_tokens._entries[token_cache_key(token)][1]
+        self.assertLessEqual(deadline, time.monotonic() + payload["exp"] - time.time() + 0.01)
+
+    async def test_token_carries_version(self):
+        user = User(email="test@example.com", roles=Role.user, token_version=4)
+        token = await auth_servise.create_access_token(data={"sub": user.email}, user=user)
+        payload = auth_servise.decode_access_token(token)
+        self.assertEqual(payload["ver"], 4)
+        self.assertNotIn("role", payload)
+
+    async def test_invalid_tokens_are_not_cached(self):
+        refresh_token = await auth_servise.create_refresh_token(data={"sub": "test@example.com"})
+        with self.assertRaises(JWTError):
+            auth_servise.decode_access_token(refresh_token)
+        with self.assertRaises(JWTError):
+            auth_servise.decode_access_token("garbage")
+        self.assertEqual(verified_tokens.stats()["size"], 0)
+
+
+class TestMarkUserChanged(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        local_users.set("test@example.com", object())
+        self.addCleanup(local_users.clear)
+
+    def test_commit_drops_local_copy(self):
+        with Session(self.engine) as session:
+            session.execute(text("SELECT 1"))
+            mark_user_changed(session, "test@example.com")
+            session.commit()
+        self.assertIsNone(local_users.get("test@example.com"))
+
+    def test_rollback_keeps_local_copy(self):
+        with Session(self.engine) as session:
+            session.execute(text("SELECT 1"))
+            mark_user_changed(session, "test@example.com")
+            session.rollback()
+        self.assertIsNotNone(local_users.get("test@example.com"))
+
+
+if __name__ == '__main__':
+    unittest.main()
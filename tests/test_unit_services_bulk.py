@@ -0,0 +1,63 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import unittest
+from datetime import date
+
+from src.services.bulk import (
+    iter_lines,
+    iter_csv_records,
+    iter_ndjson_records,
+    format_csv,
+    format_ndjson,
+)
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+class TestBulk(unittest.IsolatedAsyncioTestCase):
+
+    async def test_iter_lines_across_chunks(self):
+        lines = await collect(iter_lines(stream(b"ab", b"c\nd", "é".encode()[:1], "é".encode()[1:], b"\n")))
+        self.assertEqual(lines, ["abc\n", "dé\n"])
+
+    async def test_csv_records(self):
+        body = b'name,description\nJohn,"multi\nline, quoted"\nJane\n\nBob,ok'
+        records = await collect(iter_csv_records(stream(body[:20], body[20:])))
+        self.assertEqual(records, [
+            (1, {"name": "John", "description": "multi\nline, quoted"}),
+            (2, "Expected 2 fields, got 1"),
+            (3, {"name": "Bob", "description": "ok"}),
+        ])
+
+    async def test_ndjson_records(self):
+        body = b'{"name": "John"}\n\nnot json\n[1]\n'
+        records = await collect(iter_ndjson_records(stream(body)))
+        self.assertEqual(records[0], (1, {"name": "John"}))
+        self.assertTrue(records[1][1].startswith("Invalid JSON"))
+        self.assertEqual(records[2], (3, "Expected a JSON object"))
+
+    def test_format_ndjson(self):
+        rows = [{"id": 1, "born_date": date(1990, 1, 2)}, {"id": 2, "born_date": date(1991, 3, 4)}]
+        self.assertEqual(
+            format_ndjson(rows),
+            '{"id": 1, "born_date": "1990-01-02"}\n{"id": 2, "born_date": "1991-03-04"}\n',
+        )
+
+    def test_format_csv(self):
+        rows = [{"id": 1, "name": "Doe, John", "extra": "x"}]
+        self.assertEqual(format_csv(rows, ["id", "name"], header=True), 'id,name\r\n1,"Doe, John"\r\n')
+        self.assertEqual(format_csv(rows, ["id", "name"]), '1,"Doe, John"\r\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import unittest
+from unittest.mock import patch
+
+from src.services.cache import TTLCache
+
+
+class TestTTLCache(unittest.TestCase):
+
+    def test_hits_and_misses(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        self.assertIsNone(cache.get("a"))
+        cache.set("a", 1)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats(), {"size": 1, "maxsize": 2, "hits": 1, "misses": 1, "hit_ratio": 0.5})
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_entries_expire(self):
+        cache = TTLCache(maxsize=3, ttl=60)
+        with patch("src.services.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+            cache.set("b", 2, ttl=5)
+            cache.set("c", 3, ttl=600)
+        with patch("src.services.cache.time.monotonic", return_value=106.0):
+            self.assertEqual(cache.get("a"), 1)
+            self.assertIsNone(cache.get("b"))
+        with patch("src.services.cache.time.monotonic", return_value=160.0):
+            self.assertIsNone(cache.get("a"))
+            self.assertIsNone(cache.get("c"))
+
+    def test_pop_and_clear(self):
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.pop("a")
+        self.assertIsNone(cache.get("a"))
+        cache.clear()
+        self.assertIsNone(cache.get("b"))
+
+
+if __name__ == '__main__':
+    unittest.main()
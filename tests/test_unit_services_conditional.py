@@ -0,0 +1,62 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import unittest
+from datetime import datetime
+
+from starlette.requests import Request
+
+from src.services.conditional import (
+    contact_etag,
+    list_etag,
+    http_date,
+    is_conditional,
+    not_modified,
+)
+
+
+def make_request(**headers) -> Request:
+    raw = [(key.replace("_", "-").lower().encode(), value.encode()) for key, value in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+class TestConditional(unittest.TestCase):
+
+    def setUp(self):
+        self.updated_at = datetime(2023, 11, 15, 23, 44, 1, 9042)
+        self.etag = contact_etag(1, 3)
+
+    def test_list_etag_changes_with_versions(self):
+        self.assertEqual(list_etag([(1, 1), (2, 1)]), list_etag([(1, 1), (2, 1)]))
+        self.assertNotEqual(list_etag([(1, 1), (2, 1)]), list_etag([(1, 1), (2, 2)]))
+        self.assertNotEqual(list_etag([(1, 1), (2, 1)]), list_etag([(1, 1), (3, 1)]))
+
+    def test_http_date(self):
+        self.assertEqual(http_date(self.updated_at), "Wed, 15 Nov 2023 23:44:01 GMT")
+
+    def test_is_conditional(self):
+        self.assertFalse(is_conditional(make_request()))
+        self.assertTrue(is_conditional(make_request(If_None_Match=self.etag)))
+
+    def test_if_none_match(self):
+        self.assertTrue(not_modified(make_request(If_None_Match=self.etag), self.etag))
+        self.assertTrue(not_modified(make_request(If_None_Match=f'"x", W/{self.etag}'), self.etag))
+        self.assertTrue(not_modified(make_request(If_None_Match="*"), self.etag))
+        self.assertFalse(not_modified(make_request(If_None_Match='"1-2"'), self.etag))
+
+    def test_if_modified_since(self):
+        since = http_date(self.updated_at)
+        self.assertTrue(not_modified(make_request(If_Modified_Since=since), self.etag, self.updated_at))
+        later = self.updated_at.replace(second=2)
+        self.assertFalse(not_modified(make_request(If_Modified_Since=since), self.etag, later))
+        self.assertFalse(not_modified(make_request(If_Modified_Since="garbage"), self.etag, self.updated_at))
+
+    def test_if_none_match_takes_precedence(self):
+        request = make_request(If_None_Match='"1-2"', If_Modified_Since=http_date(self.updated_at))
+        self.assertFalse(not_modified(request, self.etag, self.updated_at))
+
+
+if __name__ == '__main__':
+    unittest.main()
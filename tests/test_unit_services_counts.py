@@ -0,0 +1,143 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import orjson
+import redis.asyncio as redis
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.services import counts
+from src.services.counts import (
+    COUNT_INVALIDATION_CHANNEL,
+    CountCache,
+    listen_for_invalidations,
+    mark_changed,
+    publish_invalidations,
+    row_counts,
+)
+
+
+class TestCountCache(unittest.TestCase):
+
+    def test_get_set_invalidate(self):
+        cache = CountCache(ttl=60)
+        self.assertIsNone(cache.get("contacts"))
+        cache.set("contacts", 42)
+        self.assertEqual(cache.get("contacts"), 42)
+        cache.invalidate("contacts")
+        self.assertIsNone(cache.get("contacts"))
+
+    def test_expires_after_ttl(self):
+        cache = CountCache(ttl=60)
+        with patch("src.services.counts.time.monotonic", return_value=100.0):
+            cache.set("contacts", 42)
+        with patch("src.services.counts.time.monotonic", return_value=159.0):
+            self.assertEqual(cache.get("contacts"), 42)
+        with patch("src.services.counts.time.monotonic", return_value=160.0):
+            self.assertIsNone(cache.get("contacts"))
+
+    def test_clear(self):
+        cache = CountCache(ttl=60)
+        cache.set("contacts", 42)
+        cache.set("users", 7)
+        cache.clear()
+        self.assertIsNone(cache.get("contacts"))
+        self.assertIsNone(cache.get("users"))
+
+
+class TestMarkChanged(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        row_counts.set("contacts", 42)
+
+    def tearDown(self):
+        row_counts.invalidate("contacts")
+
+    def test_commit_invalidates(self):
+        with Session(self.engine) as session:
+            session.execute(text("SELECT 1"))
+            mark_changed(session, "contacts")
+            self.assertEqual(row_counts.get("contacts"), 42)
+            session.commit()
+        self.assertIsNone(row_counts.get("contacts"))
+
+    def test_rollback_keeps_count(self):
+        with Session(self.engine) as session:
+            session.execute(text("SELECT 1"))
+            mark_changed(session, "contacts")
+            session.rollback()
+            session.execute(text("SELECT 1"))
+            session.commit()
+        self.assertEqual(row_counts.get("contacts"), 42)
+
+
+class TestInvalidationBroadcast(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        self.r = MagicMock()
+        self.r.publish = AsyncMock()
+        patcher = patch.object(counts, "r", self.r)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        row_counts.set("contacts", 42)
+
+    def tearDown(self):
+        row_counts.clear()
+
+    async def test_commit_publishes_changed_tables(self):
+        with Session(self.engine) as session:
+            session.execute(text("SELECT 1"))
+            mark_changed(session, "contacts")
+            session.commit()
+        self.assertIsNone(row_counts.get("contacts"))
+        await asyncio.gather(*counts._invalidations)
+        self.r.publish.assert_awaited_once_with(COUNT_INVALIDATION_CHANNEL, orjson.dumps(["contacts"]))
+
+    async def test_commit_without_changes_does_not_publish(self):
+        with Session(self.engine) as session:
+            session.execute(text("SELECT 1"))
+            session.commit()
+        self.assertEqual(row_counts.get("contacts"), 42)
+        self.assertFalse(counts._invalidations)
+        self.r.publish.assert_not_called()
+
+    async def test_publish_ignores_redis_errors(self):
+        self.r.publish.side_effect = redis.ConnectionError("down")
+        with self.assertLogs("src.services.counts", level="WARNING"):
+            await publish_invalidations(["contacts"])
+
+    async def test_listener_invalidates_published_tables(self):
+        received = asyncio.Event()
+
+        async def listen():
+            yield {"type": "subscribe", "data": 1}
+            row_counts.set("contacts", 42)
+            row_counts.set("users", 7)
+            yield {"type": "message", "data": orjson.dumps(["contacts"])}
+            received.set()
+            await asyncio.Event().wait()
+
+        pubsub = MagicMock()
+        pubsub.__aenter__ = AsyncMock(return_value=pubsub)
+        pubsub.__aexit__ = AsyncMock(return_value=False)
+        pubsub.subscribe = AsyncMock()
+        pubsub.listen = listen
+        self.r.pubsub.return_value = pubsub
+        listener = asyncio.create_task(listen_for_invalidations())
+        await asyncio.wait_for(received.wait(), 1)
+        listener.cancel()
+        pubsub.subscribe.assert_awaited_once_with(COUNT_INVALIDATION_CHANNEL)
+        self.assertIsNone(row_counts.get("contacts"))
+        self.assertEqual(row_counts.get("users"), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
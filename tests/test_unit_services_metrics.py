@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import unittest
+
+from src.services.metrics import Histogram
+
+
+class TestHistogram(unittest.TestCase):
+
+    def setUp(self):
+        self.histogram = Histogram(buckets=(0.1, 1.0))
+
+    def test_snapshot_empty(self):
+        result = self.histogram.snapshot()
+        self.assertEqual(result["count"], 0)
+        self.assertEqual(result["buckets"], {"0.1": 0, "1.0": 0, "+Inf": 0})
+
+    def test_observe_cumulative_buckets(self):
+        for value in (0.05, 0.1, 0.5, 3.0):
+            self.histogram.observe(value)
+        result = self.histogram.snapshot()
+        self.assertEqual(result["count"], 4)
+        self.assertAlmostEqual(result["sum"], 3.65)
+        self.assertEqual(result["buckets"], {"0.1": 2, "1.0": 3, "+Inf": 4})
+
+
+if __name__ == '__main__':
+    unittest.main()
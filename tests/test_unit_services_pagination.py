@@ -0,0 +1,40 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import unittest
+from datetime import datetime
+
+from src.services.pagination import (
+    encode_cursor,
+    decode_cursor,
+    encode_rank_cursor,
+    decode_rank_cursor,
+)
+
+
+class TestCursor(unittest.TestCase):
+
+    def test_round_trip(self):
+        created_at = datetime(2023, 11, 15, 23, 44, 1, 9042)
+        cursor = encode_cursor(created_at, 42)
+        self.assertNotIn("=", cursor)
+        self.assertEqual(decode_cursor(cursor), (created_at, 42))
+
+    def test_invalid_cursor(self):
+        for cursor in ("not-a-cursor", "", encode_cursor(datetime.now(), 1)[:-4]):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+    def test_rank_round_trip(self):
+        cursor = encode_rank_cursor(0.10000000149011612, 7)
+        self.assertEqual(decode_rank_cursor(cursor), (0.10000000149011612, 7))
+
+    def test_cursor_kinds_are_not_interchangeable(self):
+        with self.assertRaises(ValueError):
+            decode_cursor(encode_rank_cursor(0.5, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import asyncio
+import threading
+import unittest
+
+from src.services.auth import auth_servise
+from src.services.passwords import PasswordPool
+
+
+class TestPasswordPool(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.pool = PasswordPool(workers=1)
+
+    def tearDown(self):
+        self.pool.shutdown()
+
+    async def test_run_returns_result(self):
+        result = await self.pool.run(pow, 2, 10)
+        self.assertEqual(result, 1024)
+        stats = self.pool.stats()
+        self.assertEqual(stats["workers"], 1)
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["queue_wait_seconds"]["count"], 1)
+
+    async def test_run_propagates_errors(self):
+        with self.assertRaises(ZeroDivisionError):
+            await self.pool.run(divmod, 1, 0)
+        self.assertEqual(self.pool.stats()["pending"], 0)
+
+    async def test_calls_beyond_workers_are_queued(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        first = asyncio.create_task(self.pool.run(release.wait))
+        second = asyncio.create_task(self.pool.run(lambda: "done"))
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.pool.stats()["pending"], 2)
+        self.assertFalse(second.done())
+        release.set()
+        self.assertEqual(await second, "done")
+        await first
+        stats = self.pool.stats()
+        self.assertEqual(stats["pending"], 0)
+        self.assertEqual(stats["queue_wait_seconds"]["count"], 2)
+        self.assertGreaterEqual(stats["queue_wait_seconds"]["sum"], 0.05)
+
+    async def test_cancelled_queued_call_is_not_pending(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+        first = asyncio.create_task(self.pool.run(release.wait))
+        queued = asyncio.create_task(self.pool.run(lambda: "never"))
+        await asyncio.sleep(0.05)
+        queued.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+        self.assertEqual(self.pool.stats()["pending"], 1)
+        release.set()
+        await first
+        self.assertEqual(self.pool.stats()["pending"], 0)
+
+    async def test_auth_hashes_in_pool(self):
+        hashed = await auth_servise.get_password_hash_async("secret")
+        self.assertTrue(await auth_servise.verify_password_async("secret", hashed))
+        self.assertFalse(await auth_servise.verify_password_async("wrong", hashed))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from fastapi import HTTPException
+from fastapi.dependencies.utils import get_dependant
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import settings
+from src.database.models import Role, User
+from src.services.auth import auth_servise, verified_tokens
+from src.services.roles import RoleAccess, StatelessRoleAccess
+from src.services.user_cache import local_users
+
+
+class TestRoleAccess(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.user = User(id=1, email="test@example.com", roles=Role.user, token_version=1)
+        self.access = RoleAccess([Role.admin, Role.moderator])
+
+    def test_depends_on_current_user(self):
+        self.assertNotIsInstance(self.access, StatelessRoleAccess)
+        dependant = get_dependant(path="/", call=self.access)
+        self.assertEqual([d.call for d in dependant.dependencies], [auth_servise.get_current_user])
+
+    async def test_role_from_user(self):
+        with self.assertRaises(HTTPException) as raised:
+            await self.access(self.user)
+        self.assertEqual(raised.exception.status_code, 403)
+        self.user.roles = Role.moderator
+        await self.access(self.user)
+
+
+class TestStatelessRoleAccess(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.user = User(id=1, email="test@example.com", roles=Role.user, token_version=1)
+        self.db = AsyncMock(spec=AsyncSession)
+        patcher = patch.object(settings, "stateless_roles", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.access = RoleAccess([Role.admin, Role.moderator])
+        verified_tokens.clear()
+        self.addCleanup(verified_tokens.clear)
+        local_users.clear()
+        self.addCleanup(local_users.clear)
+        patcher = patch.object(auth_servise, "get_current_user", AsyncMock(return_value=self.user))
+        self.get_current_user = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def token(self, user=None):
+        return await auth_servise.create_access_token(data={"sub": self.user.email}, user=user)
+
+    def test_created_in_stateless_mode(self):
+        self.assertIsInstance(self.access, StatelessRoleAccess)
+
+    async def test_role_from_claims(self):
+        self.user.roles = Role.moderator
+        token = await self.token(self.user)
+        self.user.roles = Role.user
+        await self.access(token, self.db)
+        self.get_current_user.assert_not_awaited()
+
+    async def test_forbidden_from_claims(self):
+        with self.assertRaises(HTTPException) as raised:
+            await self.access(await self.token(self.user), self.db)
+        self.assertEqual(raised.exception.status_code, 403)
+        self.get_current_user.assert_not_awaited()
+
+    async def test_without_role_claim_loads_user(self):
+        self.user.roles = Role.admin
+        with patch.object(settings, "stateless_roles", False):
+            token = await self.token(self.user)
+        await self.access(token, self.db)
+        self.get_current_user.assert_awaited_once()
+
+    async def test_cached_user_rejects_revoked_token(self):
+        self.user.roles = Role.admin
+        token = await self.token(self.user)
+        local_users.set(self.user.email, User(email=self.user.email, roles=Role.admin, token_version=2))
+        with self.assertRaises(HTTPException) as raised:
+            await self.access(token, self.db)
+        self.assertEqual(raised.exception.status_code, 401)
+        self.get_current_user.assert_not_awaited()
+
+    async def test_cached_user_role_wins(self):
+        self.user.roles = Role.admin
+        token = await self.token(self.user)
+        local_users.set(self.user.email, User(email=self.user.email, roles=Role.user, token_version=1))
+        with self.assertRaises(HTTPException) as raised:
+            await self.access(token, self.db)
+        self.assertEqual(raised.exception.status_code, 403)
+
+    async def test_token_lifetime_is_capped(self):
+        token = await auth_servise.create_access_token(
+            data={"sub": self.user.email}, expires_delta=86400, user=self.user
+        )
+        claims = auth_servise.decode_access_token(token)
+        self.assertLessEqual(claims["exp"] - claims["iat"], settings.stateless_token_ttl)
+
+
+if __name__ == '__main__':
+    unittest.main()
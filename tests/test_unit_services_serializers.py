@@ -0,0 +1,68 @@
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+import json
+import unittest
+from datetime import date
+
+from fastapi import Response
+
+from src.database.models import Contact
+from src.schemas import ContactResponse
+from src.services.serializers import (
+    list_adapter,
+    list_response,
+    item_response,
+    serialize_list,
+    parse_fields,
+    partial_model,
+)
+
+
+class TestSerializers(unittest.TestCase):
+
+    def setUp(self):
+        self.fields = dict(
+            id=1,
+            name="test",
+            last_name="test",
+            e_mail="test@example.com",
+            phone_number="123456789",
+            born_date=date(2000, 1, 1),
+            description="test contact",
+        )
+
+    def test_adapter_is_cached(self):
+        self.assertIs(list_adapter(ContactResponse), list_adapter(ContactResponse))
+
+    def test_serialize_orm_objects_and_mappings(self):
+        expected = [{**self.fields, "born_date": "2000-01-01"}]
+        from_orm = json.loads(serialize_list(ContactResponse, [Contact(**self.fields)]))
+        from_mapping = json.loads(serialize_list(ContactResponse, [dict(self.fields, created_at=None)]))
+        self.assertEqual(from_orm, expected)
+        self.assertEqual(from_mapping, expected)
+
+    def test_list_response_keeps_headers(self):
+        injected = Response()
+        injected.headers["X-Next-Cursor"] = "abc"
+        response = list_response(ContactResponse, [self.fields], injected)
+        self.assertEqual(response.media_type, "application/json")
+        self.assertEqual(response.headers["x-next-cursor"], "abc")
+        self.assertEqual(int(response.headers["content-length"]), len(response.body))
+
+    def test_parse_fields(self):
+        self.assertEqual(parse_fields("e_mail, name", ContactResponse), ("name", "e_mail", "id"))
+        with self.assertRaises(ValueError):
+            parse_fields("name,password", ContactResponse)
+
+    def test_partial_model(self):
+        model = partial_model(ContactResponse, ("name", "id"))
+        self.assertIs(model, partial_model(ContactResponse, ("name", "id")))
+        response = item_response(model, Contact(**self.fields))
+        self.assertEqual(json.loads(response.body), {"name": "test", "id": 1})
+
+
+if __name__ == '__main__':
+    unittest.main()